@@ -1,13 +1,16 @@
 import pygame
 import turtle
 import time
-import random
-import openai
-from dotenv import load_dotenv
 import os
+import sys
+
+# shared game components live in snake-pygame/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snake-pygame'))
+from turtle_board import TurtleBoard
+from levels import load_level
+from turtle_render import CanvasRenderer
+from pathfinding import find_path
 
-load_dotenv()
-openai.api_key = os.getenv("OPENAI_API_KEY")
 # Convert all coordinates to grid cells
 def to_grid(pos, grid_unit=20):
 
@@ -29,50 +32,25 @@ def get_hint_path():
     """
     Generates a hint path for the snake to safely reach the food.
 
-    Uses OpenAI's GPT model to calculate a safe path avoiding obstacles and the snake's body.
+    Runs a local breadth-first search (pathfinding.py) for the shortest path
+    that avoids the obstacles and the snake's body.
     """
 
     global head, food, segments, obstacles
-    grid_size = [96, 54]  # assuming 20px per grid cell on a 1920x1080 canvas
     grid_unit = 20
 
-    head_pos = to_grid((head.xcor(), head.ycor()))
-    food_pos = to_grid((food.xcor(), food.ycor()))
-    snake_body = [to_grid((seg.xcor(), seg.ycor())) for seg in segments]
-    obs_pos = [to_grid((obs.xcor(), obs.ycor())) for obs in obstacles]
-
-    prompt = f"""
-            You are helping in a Snake game played on a grid. The grid size is {grid_size[0]} columns by {grid_size[1]} rows.
-            The snake's head is at {head_pos}.
-            Its body is at {snake_body}.
-            The food is at {food_pos}.
-            The obstacles are at {obs_pos}.
-
-            Generate a list of directions (UP, DOWN, LEFT, RIGHT) that safely guide the snake from its head to the food.
-            Avoid all obstacles and the snake's own body.
-            Make sure the final grid position exactly matches the food location.
-            Respond only with a Python list, like ["RIGHT", "UP", "UP", "LEFT"]. No extra words.
-            """
-
-    try:
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}]
-        )
-
-        raw_output = response['choices'][0]['message']['content'].strip()
-
-        try:
-            start = raw_output.index("[")
-            end = raw_output.index("]", start) + 1
-            directions = eval(raw_output[start:end])  # safely extract the list
-            highlight_path(head_pos, directions, grid_unit)
-        except Exception as parse_err:
-            print("Hint failed to parse directions:", parse_err)
-            print("Raw output from GPT:", raw_output)
-
-    except Exception as e:
-        print("Hint failed:", e)
+    head_pos = to_grid(head.pos())
+    food_pos = to_grid(food.pos())
+    snake_body = [to_grid(pos) for pos in segments]
+    obs_pos = [to_grid(obs) for obs in obstacles]
+
+    directions = find_path(head_pos, food_pos, obs_pos, snake_body, bounds=(-19, 19, -14, 14),
+                           heading=head.direction)
+    if directions is None:
+        hint_turtle.clearstamps()
+        print("Hint: no safe path to the food")
+        return
+    highlight_path(head_pos, directions, grid_unit)
 
 
 def highlight_path(start_pos, directions, unit):
@@ -126,6 +104,8 @@ wn.tracer(0)  # Turns off the screen updates
 
 # List to store obstacles
 obstacles = []
+obstacle_items = [] # their canvas rectangles
+level = 0 # seed of the current layout, advanced on every start and game over
 
 def main_menu():
 
@@ -163,28 +143,48 @@ def main_menu():
     wn.onkeypress(start_game, "m")  # Press 'm' to start main play
     wn.onkeypress(quit_game, "q")   # Press 'q' to quit
 
-def create_obstacles(num_obstacles):
+def create_obstacles(seed):
 
     """
-    Creates a specified number of obstacles on the screen.
+    Creates the obstacles of a generated level on the screen.
 
     Args:
-        num_obstacles (int): The number of obstacles to create.
+        seed (int): The level to load, the same seed gives the same layout.
+    """
+
+    global obstacles, obstacle_items
+    # Clear any previous obstacles, off the board and off the canvas
+    board.clear_obstacles()
+    renderer.canvas.delete(*obstacle_items)
+    obstacles.clear()
+    # generated once per seed and cached: the free cells stay connected
+    # and the cells in line with the spawn point stay clear
+    for pos in load_level(seed).positions():
+        if board.add_obstacle(pos):
+            obstacles.append(pos)
+
+    # Obstacles never move, so each layout is drawn once as a static layer
+    obstacle_items = renderer.static_layer(obstacles, "black")
+
+def next_level():
+
+    """
+    Advances to the next level and swaps in its obstacle layout.
     """
 
-    global obstacles
-    obstacles.clear()  # Clear any previous obstacles
-    for _ in range(num_obstacles):
-        obstacle = turtle.Turtle()
-        obstacle.speed(0)
-        obstacle.shape("square")
-        obstacle.color("black")
-        obstacle.penup()
-        x = random.randint(-19, 19) * 20
-        y = random.randint(-14, 14) * 20
-        obstacle.goto(x, y)
+    global level
+    level += 1
+    create_obstacles(level)
+
+def place_food():
+
+    """
+    Moves the food to a random free cell, off the snake and the obstacles.
+    """
 
-        obstacles.append(obstacle)
+    pos = board.place_food(avoid=[head.pos()])
+    if pos is not None:
+        food.goto(pos)
 
 def start_snake_game():
 
@@ -194,8 +194,15 @@ def start_snake_game():
     Initializes the snake, food, obstacles, and game logic.
     """
 
-    global head, food, segments, pen, score, high_score, obstacles
+    global head, food, segments, pen, score, high_score, renderer, obstacles, obstacle_items, board
     wn.clear()
+    obstacle_items = [] # wn.clear() deleted the last game's rectangles
+
+    # Body segments and obstacles are drawn on the canvas directly
+    renderer = CanvasRenderer(wn)
+
+    # Obstacles, segments and food of the 39x29 board, indexed by cell
+    board = TurtleBoard(-19, 19, -14, 14)
     
     # Snake head
     head = turtle.Turtle()
@@ -213,8 +220,9 @@ def start_snake_game():
     food.color("red")
     food.penup()
     food.goto(0,100)
+    board.set_food(food.pos())
 
-    segments = []
+    segments = renderer.body("light green", board)
 
     # Pen
     pen = turtle.Turtle()
@@ -234,8 +242,8 @@ def start_snake_game():
     pen.goto(0, 500)
     pen.write("Your Score: 0  High Score: 0", align="center", font=("Courier", 24, "normal"))
 
-    # Create obstacles
-    create_obstacles(20)  # You can change the number of obstacles here
+    # Create obstacles, a new layout every game (levels.DENSITY sets how many)
+    next_level()
 
     # Functions
     def go_up():
@@ -269,52 +277,47 @@ def start_snake_game():
         elif head.direction == "right":
             head.setx(head.xcor() + 20)
     
+    def game_over():
+
+        """
+        Plays the game over sound and puts the snake back at the start.
+        """
+
+        global score, delay
+        pygame.mixer.music.load("gameover.wav")  # Load the game over sound
+        pygame.mixer.music.play()  # Play the game over sound
+        time.sleep(1)  # Give time for the sound to play
+        head.goto(0, 0)
+        head.direction = "stop"
+        segments.clear()
+        next_level()
+        score = 0
+        delay = 0.1
+        pen.clear()
+        pen.write(f"Your Score: {score}  High Score: {high_score}", align="center", font=("Courier", 24, "normal"))
+
     def game_loop():
 
         """
         Main game loop that updates the game state.
         """
 
+        global score, high_score, delay
         wn.update()
 
-        # Move segments in reverse order
-        for index in range(len(segments)-1, 0, -1):
-            x = segments[index-1].xcor()
-            y = segments[index-1].ycor()
-            segments[index].goto(x, y)
-
-        # Move first segment to head's position
-        if len(segments) > 0:
-            segments[0].goto(head.xcor(), head.ycor())
-
-        # Check for a collision with the border
-        if head.xcor()>390 or head.xcor()<-390 or head.ycor()>290 or head.ycor()<-290:
-            pygame.mixer.music.load("gameover.wav")  # Load the game over sound
-            pygame.mixer.music.play()  # Play the game over sound
-            time.sleep(1)  # Give time for the sound to play
-            head.goto(0,0)
-            head.direction = "stop"
-            for segment in segments:
-                segment.goto(1000, 1000)
-            segments.clear()
-            global score, high_score, delay
-            score = 0
-            delay = 0.1
-            pen.clear()
-            pen.write(f"Your Score: {score}  High Score: {high_score}", align="center", font=("Courier", 24, "normal"))
+        # Move the body one step behind the head
+        segments.follow(head.pos())
+
+        # Check for a collision with the border, an obstacle or the body
+        # (the neck is on the head's cell, any other segment there is a hit)
+        if board.blocked(head.pos()) or board.segments_at(head.pos()) > 1:
+            game_over()
 
         # Check for a collision with the food
-        if head.distance(food) < 20:
-            x = random.randint(-19, 19) * 20
-            y = random.randint(-14, 14) * 20
-            food.goto(x, y)
-
-            new_segment = turtle.Turtle()
-            new_segment.speed(0)
-            new_segment.shape("square")
-            new_segment.color("light green")
-            new_segment.penup()
-            segments.append(new_segment)
+        if board.is_food(head.pos()):
+            place_food()
+
+            segments.grow()
             delay = max(0.05, delay - 0.06)
             score += 10
             
@@ -327,23 +330,6 @@ def start_snake_game():
             pen.clear()
             pen.write(f"Your Score: {score}  High Score: {high_score}", align="center", font=("Courier", 24, "normal"))
 
-        # Check for collision with obstacles
-        for obstacle in obstacles:
-            if head.distance(obstacle) < 20:
-                pygame.mixer.music.load("gameover.wav")  # Load the game over sound
-                pygame.mixer.music.play()  # Play the game over sound
-                time.sleep(1)  # Give time for the sound to play
-                head.goto(0, 0)
-                head.direction = "stop"
-                for segment in segments:
-                    segment.goto(1000, 1000)
-                segments.clear()
-                score = 0
-                delay = 0.1
-                pen.clear()
-                pen.write(f"Your Score: {score}  High Score: {high_score}", align="center", font=("Courier", 24, "normal"))
-                break
-
         move()
         wn.ontimer(game_loop, int(delay * 1000))
     
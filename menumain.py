@@ -1,16 +1,25 @@
 
 
 import tkinter as tk
-import subprocess
+import os
+import sys
+
+# shared game components live in snake-pygame/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snake-pygame'))
+from launcher import Launcher
+
+# game scripts are looked up next to this menu
+script_dir = os.path.dirname(os.path.abspath(__file__))
+launcher = None
 
 def run_script(script_name):
     """
-    Executes a Python script using the subprocess module.
+    Starts a Python script from the warm launcher process.
 
     Args:
         script_name (str): The name of the Python script to be executed.
     """
-    subprocess.run(['python', script_name])
+    launcher.launch(os.path.join(script_dir, script_name))
 
 def create_window():
     
@@ -20,6 +29,10 @@ def create_window():
     The menu includes buttons to launch different game modes or exit the application.
     """
 
+    global launcher
+    # fork the launcher before Tk starts so games open without a cold start
+    launcher = Launcher()
+
     window = tk.Tk()
     window.title("Snake Game Menu")
 
@@ -32,13 +45,14 @@ def create_window():
     button2 = tk.Button(window, text="Play Obstacle", command=lambda: run_script('Obstacles.py'))
     button2.pack(pady=5)
 
-    button3 = tk.Button(window, text="Play SecondRival", command=lambda: run_script('SecondRival.py'))
+    button3 = tk.Button(window, text="Play SecondRival", command=lambda: run_script('secondrival.py'))
     button3.pack(pady=5)
 
     button4 = tk.Button(window, text="Exit", command=window.quit)
     button4.pack(pady=20)
 
     window.mainloop()
+    launcher.close()
 
 if __name__ == "__main__":
     create_window()
\ No newline at end of file
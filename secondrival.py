@@ -2,6 +2,13 @@ import pygame
 import turtle
 import time
 import random
+import os
+import sys
+
+# shared game components live in snake-pygame/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snake-pygame'))
+from turtle_board import TurtleBoard
+from turtle_render import CanvasRenderer
 
 # Initialize pygame mixer for audio
 pygame.mixer.init()
@@ -54,16 +61,30 @@ def main_menu():
     wn.onkeypress(start_game, "m")
     wn.onkeypress(quit_game, "q")
 
+def place_food():
+    """
+    Moves the food to a random free cell, off the player and both rivals.
+    """
+    pos = board.place_food(avoid=[head.pos(), comp_head.pos(), orange_head.pos()])
+    if pos is not None:
+        food.goto(pos)
+
 def start_snake_game():
     """
     Starts the Snake Game with rival snakes.
     """
-    global head, food, segments, pen, score, high_score
+    global head, food, segments, pen, score, high_score, renderer, board
     global comp_head, comp_segments, comp_direction
     global orange_head, orange_direction
 
     wn.clear()
 
+    # Body segments are drawn on the canvas directly
+    renderer = CanvasRenderer(wn)
+
+    # Segments and food of the 39x39 board the food can spawn on
+    board = TurtleBoard(-19, 19, -19, 19)
+
     # Player Snake
     head = turtle.Turtle()
     head.speed(0)
@@ -80,8 +101,9 @@ def start_snake_game():
     food.color("red")
     food.penup()
     food.goto(0, 100)
+    board.set_food(food.pos())
 
-    segments = []
+    segments = renderer.body("light green", board)
 
     # Rival Snake 1 (Blue - AI lawn mower)
     comp_head = turtle.Turtle()
@@ -91,7 +113,7 @@ def start_snake_game():
     comp_head.penup()
     comp_head.goto(200, 200)
     comp_head.direction = "right"
-    comp_segments = []
+    comp_segments = renderer.body("blue", board)
 
     # Rival Snake 2 (Orange - chaotic AI)
     orange_head = turtle.Turtle()
@@ -200,25 +222,14 @@ def start_snake_game():
         global score, high_score, delay
         wn.update()
 
-        for index in range(len(segments)-1, 0, -1):
-            x = segments[index-1].xcor()
-            y = segments[index-1].ycor()
-            segments[index].goto(x, y)
-
-        if len(segments) > 0:
-            segments[0].goto(head.xcor(), head.ycor())
+        segments.follow(head.pos())
 
         if head.xcor() > 390 or head.xcor() < -390 or head.ycor() > 390 or head.ycor() < -390:
             game_over()
 
         if head.distance(food) < 20:
-            food.goto(random.randint(-390, 390), random.randint(-390, 390))
-            new_segment = turtle.Turtle()
-            new_segment.speed(0)
-            new_segment.shape("square")
-            new_segment.color("light green")
-            new_segment.penup()
-            segments.append(new_segment)
+            place_food()
+            segments.grow()
             delay -= 0.1
             score += 10
             pygame.mixer.music.load("apple.wav")
@@ -247,8 +258,6 @@ def start_snake_game():
         time.sleep(1)
         head.goto(0, 0)
         head.direction = "stop"
-        for segment in segments:
-            segment.goto(1000, 1000)
         segments.clear()
         comp_head.goto(200, 200)
         comp_head.direction = "right"
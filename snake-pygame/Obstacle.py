@@ -1,8 +1,10 @@
 import pygame
 import turtle
 import time
-import random
 import os
+from turtle_board import TurtleBoard
+from levels import load_level
+from turtle_render import CanvasRenderer
 
 # Initialize pygame mixer for audio
 pygame.mixer.init()
@@ -23,6 +25,8 @@ wn.tracer(0)  # Turns off the screen updates
 
 # List to store obstacles
 obstacles = []
+obstacle_items = [] # their canvas rectangles
+level = 0 # seed of the current layout, advanced on every start and game over
 
 def main_menu():
     wn.clear()
@@ -54,24 +58,43 @@ def main_menu():
     wn.onkeypress(start_game, "m")  # Press 'm' to start main play
     wn.onkeypress(quit_game, "q")   # Press 'q' to quit
 
-def create_obstacles(num_obstacles):
-    global obstacles
-    obstacles.clear()  # Clear any previous obstacles
-    for _ in range(num_obstacles):
-        obstacle = turtle.Turtle()
-        obstacle.speed(0)
-        obstacle.shape("square")
-        obstacle.color("black")
-        obstacle.penup()
-        x = random.randint(-19, 19) * 20
-        y = random.randint(-14, 14) * 20
-        obstacle.goto(x, y)
-
-        obstacles.append(obstacle)
+def create_obstacles(seed):
+    global obstacles, obstacle_items
+    # Clear any previous obstacles, off the board and off the canvas
+    board.clear_obstacles()
+    renderer.canvas.delete(*obstacle_items)
+    obstacles.clear()
+    # generated once per seed and cached: the free cells stay connected
+    # and the cells in line with the spawn point stay clear
+    for pos in load_level(seed).positions():
+        if board.add_obstacle(pos):
+            obstacles.append(pos)
+
+    # Obstacles never move, so each layout is drawn once as a static layer
+    obstacle_items = renderer.static_layer(obstacles, "black")
+
+def next_level():
+    # the next seed's layout replaces the current one
+    global level
+    level += 1
+    create_obstacles(level)
+
+def place_food():
+    # random free cell, off the snake and the obstacles
+    pos = board.place_food(avoid=[head.pos()])
+    if pos is not None:
+        food.goto(pos)
 
 def start_snake_game():
-    global head, food, segments, pen, score, high_score, obstacles
+    global head, food, segments, pen, score, high_score, renderer, obstacles, obstacle_items, board
     wn.clear()
+    obstacle_items = [] # wn.clear() deleted the last game's rectangles
+
+    # Body segments and obstacles are drawn on the canvas directly
+    renderer = CanvasRenderer(wn)
+
+    # Obstacles, segments and food of the 39x29 board, indexed by cell
+    board = TurtleBoard(-19, 19, -14, 14)
 
     def quit_game():
         turtle.bye()
@@ -93,8 +116,9 @@ def start_snake_game():
     food.color("red")
     food.penup()
     food.goto(0,100)
+    board.set_food(food.pos())
 
-    segments = []
+    segments = renderer.body("light green", board)
 
     # Pen
     pen = turtle.Turtle()
@@ -106,8 +130,8 @@ def start_snake_game():
     pen.goto(0, 500)
     pen.write("Your Score: 0  High Score: 0", align="center", font=("Courier", 24, "normal"))
 
-    # Create obstacles
-    create_obstacles(20)  # You can change the number of obstacles here
+    # Create obstacles, a new layout every game (levels.DENSITY sets how many)
+    next_level()
 
     # Functions
     def go_up():
@@ -136,47 +160,37 @@ def start_snake_game():
         elif head.direction == "right":
             head.setx(head.xcor() + 20)
     
+    def game_over():
+        global score, delay
+        pygame.mixer.music.load("gameover.wav")  # Load the game over sound
+        pygame.mixer.music.play()  # Play the game over sound
+        time.sleep(1)  # Give time for the sound to play
+        head.goto(0, 0)
+        head.direction = "stop"
+        segments.clear()
+        next_level()
+        score = 0
+        delay = 0.1
+        pen.clear()
+        pen.write(f"Your Score: {score}  High Score: {high_score}", align="center", font=("Courier", 24, "normal"))
+
     def game_loop():
+        global score, high_score, delay
         wn.update()
 
-        # Move segments in reverse order
-        for index in range(len(segments)-1, 0, -1):
-            x = segments[index-1].xcor()
-            y = segments[index-1].ycor()
-            segments[index].goto(x, y)
-
-        # Move first segment to head's position
-        if len(segments) > 0:
-            segments[0].goto(head.xcor(), head.ycor())
-
-        # Check for a collision with the border
-        if head.xcor()>390 or head.xcor()<-390 or head.ycor()>290 or head.ycor()<-290:
-            pygame.mixer.music.load("gameover.wav")  # Load the game over sound
-            pygame.mixer.music.play()  # Play the game over sound
-            time.sleep(1)  # Give time for the sound to play
-            head.goto(0,0)
-            head.direction = "stop"
-            for segment in segments:
-                segment.goto(1000, 1000)
-            segments.clear()
-            global score, high_score, delay
-            score = 0
-            delay = 0.1
-            pen.clear()
-            pen.write(f"Your Score: {score}  High Score: {high_score}", align="center", font=("Courier", 24, "normal"))
+        # Move the body one step behind the head
+        segments.follow(head.pos())
+
+        # Check for a collision with the border, an obstacle or the body
+        # (the neck is on the head's cell, any other segment there is a hit)
+        if board.blocked(head.pos()) or board.segments_at(head.pos()) > 1:
+            game_over()
 
         # Check for a collision with the food
-        if head.distance(food) < 20:
-            x = random.randint(-19, 19) * 20
-            y = random.randint(-14, 14) * 20
-            food.goto(x, y)
-
-            new_segment = turtle.Turtle()
-            new_segment.speed(0)
-            new_segment.shape("square")
-            new_segment.color("light green")
-            new_segment.penup()
-            segments.append(new_segment)
+        if board.is_food(head.pos()):
+            place_food()
+
+            segments.grow()
             delay = max(0.05, delay - 0.06)
             score += 10
             
@@ -189,23 +203,6 @@ def start_snake_game():
             pen.clear()
             pen.write(f"Your Score: {score}  High Score: {high_score}", align="center", font=("Courier", 24, "normal"))
 
-        # Check for collision with obstacles
-        for obstacle in obstacles:
-            if head.distance(obstacle) < 20:
-                pygame.mixer.music.load("gameover.wav")  # Load the game over sound
-                pygame.mixer.music.play()  # Play the game over sound
-                time.sleep(1)  # Give time for the sound to play
-                head.goto(0, 0)
-                head.direction = "stop"
-                for segment in segments:
-                    segment.goto(1000, 1000)
-                segments.clear()
-                score = 0
-                delay = 0.1
-                pen.clear()
-                pen.write(f"Your Score: {score}  High Score: {high_score}", align="center", font=("Courier", 24, "normal"))
-                break
-
         move()
         wn.ontimer(game_loop, int(delay * 1000))
     
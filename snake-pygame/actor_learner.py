@@ -0,0 +1,171 @@
+import pickle
+import queue
+import random
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+
+from game import SnakeGameAI
+from model import Linear_QNet
+from agent import (Agent, SNAPSHOT_EVERY, csv_path, open_training_log, resume_training,
+                   warm_start, open_trajectory_store)
+from checkpoint import CheckpointWriter, training_snapshot
+from episodes import EpisodeWriter, from_game
+
+CHUNK_SIZE = 256 # transitions per message from an actor
+PUBLISH_EVERY = 4 # learner updates between weight publishes
+
+
+def actor(actor_id, seed, shared_model, version, lock, n_games, transitions, stop):
+    """
+    Plays headless games with a local copy of the shared weights.
+
+    Transitions are sent to the learner in chunks of CHUNK_SIZE and at the
+    end of every game. The local copy is refreshed whenever the learner
+    publishes a new version.
+    """
+
+    torch.set_num_threads(1)
+    # don't block on exit flushing chunks the learner will never read
+    transitions.cancel_join_thread()
+    # distinct exploration per actor and per run, from streams independent
+    # of each other and of the episode seeds
+    random_seed, numpy_seed, game_seed = np.random.SeedSequence(seed).generate_state(3).tolist()
+    random.seed(random_seed)
+    np.random.seed(numpy_seed)
+
+    agent = Agent(learner=False)
+    game = SnakeGameAI(headless=True, seed=game_seed)
+    local_version = -1
+    chunk = []
+
+    def send(scores, episodes=()):
+        states, actions, rewards, next_states, dones = zip(*chunk)
+        transitions.put((
+            np.array(states, dtype=np.uint8),
+            np.array(actions, dtype=np.uint8),
+            np.array(rewards, dtype=np.int8),
+            np.array(next_states, dtype=np.uint8),
+            np.array(dones, dtype=np.bool_),
+            scores,
+            list(episodes),
+        ))
+        chunk.clear()
+
+    try:
+        while not stop.is_set():
+            if version.value != local_version:
+                with lock:
+                    agent.model.load_state_dict(shared_model.state_dict())
+                    local_version = version.value
+            # exploration follows the global game count kept by the learner
+            agent.n_games = n_games.value
+
+            state_old = agent.get_state(game)
+            final_move = agent.get_action(state_old)
+            reward, done, score = game.play_step(final_move)
+            state_new = agent.get_state(game)
+            chunk.append((state_old, final_move, reward, state_new, done))
+
+            if done:
+                episode = from_game(game, score)
+                game.reset()
+                send([score], [episode])
+            elif len(chunk) >= CHUNK_SIZE:
+                send([])
+    except KeyboardInterrupt:
+        # Ctrl+C reaches the whole process group; the learner stops the actors
+        pass
+
+
+def train_distributed(num_actors=4, prioritized=False, log_path=csv_path, log_max_bytes=None, resume=None,
+                      store_path=None, pretrain_path=None, pretrain_epochs=1, seed=None,
+                      record_path=None):
+    """
+    Runs num_actors actor processes and learns from their transitions here.
+
+    The learner owns the Agent (replay memory, QTrainer and model). It trains
+    on every chunk that arrives, runs train_long_memory after every finished
+    game, and copies its weights into the shared-memory model every
+    PUBLISH_EVERY updates. Actor i (its exploration and its game's episode
+    seeds) is seeded with seed + i; without a seed every run draws a fresh
+    one. With record_path set, the actors' episodes are appended there.
+    """
+
+    ctx = mp.get_context('spawn')
+    agent = Agent(prioritized=prioritized)
+    total_score, record = resume_training(agent, resume)
+    warm_start(agent, pretrain_path, pretrain_epochs)
+    store = open_trajectory_store(store_path)
+    episodes = EpisodeWriter(record_path) if record_path else None
+    log = open_training_log(log_path, log_max_bytes)
+    checkpoints = CheckpointWriter()
+
+    shared_model = Linear_QNet(11, 256, 3)
+    shared_model.load_state_dict(agent.model.state_dict())
+    shared_model.share_memory()
+    version = ctx.Value('i', 0)
+    n_games = ctx.Value('i', agent.n_games)
+    lock = ctx.Lock()
+    transitions = ctx.Queue(maxsize=4 * num_actors)
+    stop = ctx.Event()
+
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    actors = [ctx.Process(target=actor, args=(i, (seed + i) % 2 ** 32, shared_model, version, lock, n_games,
+                                              transitions, stop), daemon=True)
+              for i in range(num_actors)]
+    for p in actors:
+        p.start()
+
+    updates = 0
+    try:
+        while True:
+            states, actions, rewards, next_states, dones, scores, finished = transitions.get()
+            if episodes is not None:
+                for episode in finished:
+                    episodes.write(episode)
+
+            # Train short memory on the chunk and remember experience
+            agent.train_short_memory(states, actions, rewards, next_states, dones)
+            agent.memory.push_batch(states, actions, rewards, next_states, dones)
+            if store is not None:
+                store.push_batch(states, actions, rewards, next_states, dones)
+
+            for score in scores:
+                agent.n_games += 1
+                n_games.value = agent.n_games
+                agent.train_long_memory()
+
+                if score > record:
+                    record = score
+                    checkpoints.save_model(agent.model, f"model_g3_{agent.n_games}-{score}", score)
+
+                print('Game', agent.n_games, 'Score', score, 'Record:', record)
+
+                total_score += score
+                mean_score = total_score / agent.n_games
+                log.write([agent.n_games, score, record, mean_score])
+
+                if agent.n_games % SNAPSHOT_EVERY == 0:
+                    checkpoints.save_snapshot(training_snapshot(agent, total_score=total_score, record=record))
+
+            updates += 1
+            if updates % PUBLISH_EVERY == 0:
+                with lock:
+                    shared_model.load_state_dict(agent.model.state_dict())
+                    version.value += 1
+    finally:
+        stop.set()
+        # drain so actors blocked on a full queue can exit
+        try:
+            while True:
+                transitions.get_nowait()
+        except (queue.Empty, EOFError, OSError, pickle.UnpicklingError):
+            # empty, or a message cut short by Ctrl+C
+            pass
+        for p in actors:
+            p.join(timeout=1)
+            if p.is_alive():
+                p.kill()
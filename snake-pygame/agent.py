@@ -1,91 +1,113 @@
 import torch 
 import random 
 import numpy as np
-from collections import deque 
-from game import SnakeGameAI, Direction, Point
+from memory import ReplayMemory, PrioritizedReplayMemory
+from game import SnakeGameAI, CLOCK_WISE
+from grid import DX, DY
+import features
+from vec_env import VecSnakeEnv
 from model import Linear_QNet, QTrainer 
 from helper  import plot
-import csv
-import os 
+from logger import TrainingLogWriter
+from profiler import PhaseTimer, NullTimer
+from checkpoint import CheckpointWriter, training_snapshot, restore_snapshot
+from episodes import EpisodeWriter, from_game
+from trajectories import TrajectoryWriter, TrajectoryDataset, pretrain
+import argparse
+import signal
+import sys
 
 
 MAX_MEMORY = 100_000
 BATCH_SIZE = 1000
 LR = 0.001
+SNAPSHOT_EVERY = 50 # games between full training snapshots
 
 csv_path = "training_log_2.csv"
-if not os.path.exists(csv_path):
-    with open(csv_path, mode='w', newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow(["Game", "Score", "Record", "Mean Score"])
+LOG_HEADER = ["Game", "Score", "Record", "Mean Score"]
+
+# Direction -> clock-wise index used by the feature extractor
+DIRECTION_INDEX = {direction: i for i, direction in enumerate(CLOCK_WISE)}
+
+
+def open_training_log(path=csv_path, max_bytes=None):
+    # rows are buffered and written by a background thread
+    return TrainingLogWriter(path, LOG_HEADER, max_bytes=max_bytes)
+
+
+def resume_training(agent, path, game=None):
+    # returns (total_score, record) to carry on from; (0, 0) for a fresh run
+    if path is None:
+        return 0, 0
+    counters = restore_snapshot(path, agent, game)
+    print('Resumed from', path, 'at game', agent.n_games)
+    return counters['total_score'], counters['record']
+
+
+def warm_start(agent, path, epochs=1):
+    # pretrain on a trajectory store, then refill the replay memory from it
+    if path is None:
+        return
+    dataset = TrajectoryDataset(path)
+    print('Pretraining on', len(dataset), 'transitions from', path)
+    pretrain(agent.trainer, dataset, epochs, BATCH_SIZE)
+    dataset.fill(agent.memory)
+
+
+def exit_on_sigterm():
+    # SIGTERM (kill, timeout, service managers) exits like Ctrl+C does, so the
+    # atexit flushes of the log, checkpoints and stores still run
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+
+
+def open_trajectory_store(path):
+    # every transition played is also appended to this store on disk
+    return TrajectoryWriter(path) if path else None
 
 
 class Agent: 
 
-    def __init__(self):
+    def __init__(self, prioritized=False, learner=True):
         self.n_games = 0
         self.epsilon = 0 # randomness
         self.gamma = 0.9 # discount rate  
-        self.memory = deque(maxlen=MAX_MEMORY) # auto removes old experiences
+        self.prioritized = prioritized
         self.model = Linear_QNet(11, 256, 3)
+        if not learner:
+            # acting only (get_state/get_action): no replay memory or optimizer
+            return
+        if self.prioritized:
+            self.memory = PrioritizedReplayMemory(MAX_MEMORY, batch_size=BATCH_SIZE)
+        else:
+            self.memory = ReplayMemory(MAX_MEMORY, batch_size=BATCH_SIZE) # auto removes old experiences
         self.trainer = QTrainer(self.model, lr=LR, gamma=self.gamma)
 
     def get_state(self, game):
-        head = game.snake[0]
-        point_l = Point(head.x - 20, head.y)
-        point_r = Point(head.x + 20, head.y)
-        point_u = Point(head.x, head.y - 20)
-        point_d = Point(head.x, head.y + 20)
-
-        dir_l = game.direction == Direction.LEFT
-        dir_r = game.direction == Direction.RIGHT
-        dir_u = game.direction == Direction.UP
-        dir_d = game.direction == Direction.DOWN
-
-        state = [
-            # Danger straight
-            (dir_r and game.is_collision(point_r)) or 
-            (dir_l and game.is_collision(point_l)) or
-            (dir_u and game.is_collision(point_u)) or
-            (dir_d and game.is_collision(point_d)),
-
-            # Danger right
-            (dir_u and game.is_collision(point_r)) or
-            (dir_d and game.is_collision(point_l)) or
-            (dir_l and game.is_collision(point_u)) or
-            (dir_r and game.is_collision(point_d)),
-
-            # Danger left
-            (dir_u and game.is_collision(point_l)) or
-            (dir_d and game.is_collision(point_r)) or
-            (dir_l and game.is_collision(point_d)) or
-            (dir_r and game.is_collision(point_u)),
-
-            # Move direction
-            dir_l,
-            dir_r,
-            dir_u,
-            dir_d,
-
-            # Food location
-            game.food.x < head.x,  # food left
-            game.food.x > head.x,  # food right
-            game.food.y < head.y,  # food up
-            game.food.y > head.y   # food down
-        ]
-
-        return np.array(state, dtype=int)
+        grid = game.grid
+        x, y = game.body[0]
+        head = grid.cell(x, y)
+
+        def danger(d):
+            # off the board or covered by the body
+            if head == -1:
+                cell = grid.cell(x + DX[d], y + DY[d]) # the head already left the board
+            else:
+                cell = grid.neighbours[4 * head + d]
+            return cell < 0 or grid.counts[cell] > 0
+
+        return features.state(DIRECTION_INDEX[game.direction], danger, (x, y), game.food_cell)
 
     def remember(self, state, action, reward, next_state, done):
-        self.memory.append((state, action, reward, next_state, done)) # pop oldest if full
+        self.memory.push(state, action, reward, next_state, done) # overwrite oldest if full
 
     def train_long_memory(self):
-        if len(self.memory) > BATCH_SIZE:
-            mini_sample = random.sample(self.memory, BATCH_SIZE)
-        else:
-            mini_sample = self.memory
+        if self.prioritized:
+            batch, idx, weights = self.memory.sample_with_weights(BATCH_SIZE)
+            td_errors = self.trainer.train_step(*batch, weights=weights)
+            self.memory.update_priorities(idx, td_errors)
+            return
 
-        states, actions, rewards, next_states, dones = zip(*mini_sample)
+        states, actions, rewards, next_states, dones = self.memory.sample(BATCH_SIZE)
         self.trainer.train_step(states, actions, rewards, next_states, dones)
 
     def train_short_memory(self, state, action, reward, next_state, done):
@@ -105,39 +127,71 @@ class Agent:
 
         return final_move
 
+    def get_actions(self, states):
+        # batched get_action for VecSnakeEnv: one forward pass for all games
+        self.epsilon = 80 - self.n_games
+        with torch.no_grad():
+            prediction = self.model(torch.tensor(states, dtype=torch.float))
+        moves = torch.argmax(prediction, dim=1).numpy()
+        explore = np.random.randint(0, 201, len(moves)) < self.epsilon
+        moves[explore] = np.random.randint(0, 3, explore.sum())
+        return moves
+
 
 # 👇 Function to start training (outside of the Agent class!)
-def train():
+def train(headless=False, prioritized=False, log_path=csv_path, log_max_bytes=None, resume=None,
+          profile=False, profile_every=100, trace_path=None, seed=None, record_path=None,
+          store_path=None, pretrain_path=None, pretrain_epochs=1):
     plot_scores = []
     plot_mean_scores = []
-    total_score = 0
-    record = 0
-    agent = Agent()
-    game = SnakeGameAI()
+    agent = Agent(prioritized=prioritized)
+    game = SnakeGameAI(headless=headless, seed=seed)
+    total_score, record = resume_training(agent, resume, game)
+    warm_start(agent, pretrain_path, pretrain_epochs)
+    store = open_trajectory_store(store_path)
+    log = open_training_log(log_path, log_max_bytes)
+    checkpoints = CheckpointWriter()
+    # seed and actions of every episode, for episodes.py to replay
+    episodes = EpisodeWriter(record_path) if record_path else None
+    # per-phase timings; NullTimer makes every timer call a no-op
+    timer = PhaseTimer(profile_every, trace_path) if profile or trace_path else NullTimer()
 
     while True:
         # Get current state
-        state_old = agent.get_state(game)
+        with timer.phase('get_state'):
+            state_old = agent.get_state(game)
 
         # Get move based on model or random
-        final_move = agent.get_action(state_old)
+        with timer.phase('get_action'):
+            final_move = agent.get_action(state_old)
 
         # Perform move and get new state
-        reward, done, score = game.play_step(final_move)
-        state_new = agent.get_state(game)
+        with timer.phase('play_step'):
+            reward, done, score = game.play_step(final_move)
+        with timer.phase('get_state'):
+            state_new = agent.get_state(game)
+        timer.step()
 
         # Train short memory and remember experience
-        agent.train_short_memory(state_old, final_move, reward, state_new, done)
-        agent.remember(state_old, final_move, reward, state_new, done)
+        with timer.phase('train_short_memory'):
+            agent.train_short_memory(state_old, final_move, reward, state_new, done)
+        with timer.phase('remember'):
+            agent.remember(state_old, final_move, reward, state_new, done)
+            if store is not None:
+                store.push(state_old, final_move, reward, state_new, done)
 
         if done:
+            if episodes is not None:
+                episodes.write(from_game(game, score))
             game.reset()
             agent.n_games += 1
-            agent.train_long_memory()
+            with timer.phase('train_long_memory'):
+                agent.train_long_memory()
 
             if score > record:
                 record = score
-                agent.model.save(f"model_g3_{agent.n_games}-{score}")
+                with timer.phase('checkpoint'):
+                    checkpoints.save_model(agent.model, f"model_g3_{agent.n_games}-{score}", score)
 
             print('Game', agent.n_games, 'Score', score, 'Record:', record)
 
@@ -152,12 +206,124 @@ def train():
             plot_mean_scores.append(mean_score)
 
             # Append to CSV file
-            with open(csv_path, mode='a', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow([agent.n_games, score, record, mean_score])
+            with timer.phase('log'):
+                log.write([agent.n_games, score, record, mean_score])
+
+            if agent.n_games % SNAPSHOT_EVERY == 0:
+                with timer.phase('checkpoint'):
+                    checkpoints.save_snapshot(training_snapshot(agent, game, total_score=total_score, record=record))
+
+            timer.report(agent.n_games)
+
+
+def train_vectorized(n_envs=64, prioritized=False, log_path=csv_path, log_max_bytes=None, resume=None,
+                     store_path=None, pretrain_path=None, pretrain_epochs=1, seed=None):
+    agent = Agent(prioritized=prioritized)
+    total_score, record = resume_training(agent, resume)
+    warm_start(agent, pretrain_path, pretrain_epochs)
+    store = open_trajectory_store(store_path)
+    env = VecSnakeEnv(n_envs, seed=seed)
+    log = open_training_log(log_path, log_max_bytes)
+    checkpoints = CheckpointWriter()
+    states = env.get_states()
+    one_hot = np.eye(3, dtype=int)
+
+    while True:
+        # Get moves for every game in one forward pass
+        moves = agent.get_actions(states)
+        final_moves = one_hot[moves]
+
+        # Step all games; finished ones are reset by the env
+        next_states, rewards, dones, scores = env.step(moves)
+
+        # Train short memory on the whole batch and remember experience
+        agent.train_short_memory(states, final_moves, rewards, next_states, dones)
+        agent.memory.push_batch(states, final_moves, rewards, next_states, dones)
+        if store is not None:
+            store.push_batch(states, final_moves, rewards, next_states, dones)
+
+        for score in scores[dones]:
+            agent.n_games += 1
+            total_score += score
+            mean_score = total_score / agent.n_games
+
+            if score > record:
+                record = score
+                checkpoints.save_model(agent.model, f"model_g3_{agent.n_games}-{score}", score)
+
+            print('Game', agent.n_games, 'Score', score, 'Record:', record)
+
+            log.write([agent.n_games, score, record, mean_score])
+
+            if agent.n_games % SNAPSHOT_EVERY == 0:
+                checkpoints.save_snapshot(training_snapshot(agent, total_score=total_score, record=record))
+
+        if dones.any():
+            agent.train_long_memory()
+
+        states = next_states
+
 
+def positive_int(text):
+    # argparse type for counts that must be at least 1
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"{text} is not a positive integer")
+    return value
 
 
 # 👇 Run training only if file is run directly
 if __name__ == '__main__':
-    train()
+    parser = argparse.ArgumentParser(description='Train the snake DQN agent')
+    parser.add_argument('--headless', action='store_true',
+                        help='run without a display and without the frame cap')
+    parser.add_argument('--envs', type=int, default=0,
+                        help='train on N vectorized headless games at once')
+    parser.add_argument('--prioritized', action='store_true',
+                        help='sample replay memory by TD error (prioritized replay)')
+    parser.add_argument('--actors', type=int, default=0,
+                        help='play in N actor processes and learn in this one')
+    parser.add_argument('--log', default=csv_path,
+                        help='CSV file for the per-game log of this run')
+    parser.add_argument('--log-max-mb', type=float, default=None,
+                        help='rotate the log once it grows past this size')
+    parser.add_argument('--resume', metavar='SNAPSHOT', default=None,
+                        help='continue from a training snapshot, e.g. model/snapshot.pth')
+    parser.add_argument('--profile', action='store_true',
+                        help='time each phase of the training loop and print summaries')
+    parser.add_argument('--profile-every', type=positive_int, default=None,
+                        help='games between profiler summaries (default 100)')
+    parser.add_argument('--trace', default=None,
+                        help='also write a Chrome trace of every phase to this file')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='seed the episodes of the game, so a run repeats them')
+    parser.add_argument('--record', metavar='EPISODES', default=None,
+                        help='append the seed and actions of every episode to this file')
+    parser.add_argument('--store', metavar='DIR', default=None,
+                        help='append every transition to a trajectory store on disk')
+    parser.add_argument('--pretrain', metavar='DIR', default=None,
+                        help='pretrain on a trajectory store and fill the replay memory from it first')
+    parser.add_argument('--pretrain-epochs', type=int, default=1,
+                        help='passes over the store when pretraining')
+    args = parser.parse_args()
+    if args.record and args.envs and not args.actors:
+        # VecSnakeEnv is its own simulator; episodes.py replays SnakeGameAI
+        parser.error('--record cannot be used with --envs')
+    if (args.envs or args.actors) and (args.profile or args.trace or args.profile_every):
+        # the phase timers are only wired into the single-game loop
+        parser.error('--profile, --profile-every and --trace only work without --envs and --actors')
+    exit_on_sigterm()
+    log_args = dict(log_path=args.log,
+                    log_max_bytes=int(args.log_max_mb * 1024 * 1024) if args.log_max_mb else None,
+                    resume=args.resume, store_path=args.store,
+                    pretrain_path=args.pretrain, pretrain_epochs=args.pretrain_epochs)
+    if args.actors:
+        from actor_learner import train_distributed
+        train_distributed(args.actors, prioritized=args.prioritized,
+                          seed=args.seed, record_path=args.record, **log_args)
+    elif args.envs:
+        train_vectorized(args.envs, prioritized=args.prioritized, seed=args.seed, **log_args)
+    else:
+        train(headless=args.headless, prioritized=args.prioritized,
+              profile=args.profile, profile_every=args.profile_every or 100, trace_path=args.trace,
+              seed=args.seed, record_path=args.record, **log_args)
@@ -0,0 +1,282 @@
+import argparse
+import json
+import platform
+import random
+import time
+from collections import deque
+
+import numpy as np
+import torch
+
+from game import SnakeGameAI, SnakeView, Point, CLOCK_WISE, BLOCK_SIZE
+from agent import Agent, BATCH_SIZE, MAX_MEMORY
+from memory import ReplayMemory, PrioritizedReplayMemory
+from vec_env import VecSnakeEnv
+import registry
+
+BOARDS = ((640, 480), (1280, 960)) # SnakeGameAI window sizes in pixels
+LENGTHS = (3, 50, 200) # snake lengths
+RIVALS = (1, 2, 8) # AI snakes predicted per tick
+REGRESSION = 0.10 # allowed slowdown of the median before a result is flagged
+
+
+def measure(name, params, times):
+    """
+    Summarises per-call wall times (seconds) into one result row.
+    """
+
+    times = np.asarray(times) * 1e6
+    p50, p90, p99 = np.percentile(times, [50, 90, 99])
+    return {
+        'name': name,
+        'params': params,
+        'calls': len(times),
+        'steps_per_sec': 1e6 / times.mean(),
+        'mean_us': times.mean(),
+        'p50_us': p50,
+        'p90_us': p90,
+        'p99_us': p99,
+    }
+
+
+def make_game(w, h, length):
+    """
+    Headless game whose snake already has the given length.
+
+    The body is laid out row by row from the top-left corner (boustrophedon),
+    head last, so there is free space in front of it.
+    """
+
+    game = SnakeGameAI(w, h, headless=True)
+    cols = game.grid.cols
+    cells = []
+    for i in range(length):
+        y, x = divmod(i, cols)
+        cells.append((x if y % 2 == 0 else cols - 1 - x, y))
+
+    game.body = deque(reversed(cells))
+    game.snake = SnakeView(game.body)
+    game.grid.clear()
+    game.food_sampler.clear()
+    for x, y in game.body:
+        game.grid.add(game.grid.cell(x, y))
+        game.food_sampler.occupy(x, y)
+    if length > 1:
+        (hx, hy), (nx, ny) = game.body[0], game.body[1]
+        game.direction = CLOCK_WISE[[(1, 0), (0, 1), (-1, 0), (0, -1)].index((hx - nx, hy - ny))]
+    game._place_food()
+    game.score = length - 3
+    game.frame_iteration = 0
+    return game
+
+
+def safe_action(game):
+    # first of straight/right/left that does not collide, so the run keeps going
+    idx = CLOCK_WISE.index(game.direction)
+    x, y = game.head
+    steps = ((BLOCK_SIZE, 0), (0, BLOCK_SIZE), (-BLOCK_SIZE, 0), (0, -BLOCK_SIZE))
+    for move, turn in ((0, 0), (1, 1), (2, -1)):
+        dx, dy = steps[(idx + turn) % 4]
+        if not game.is_collision(Point(x + dx, y + dy)):
+            break
+    action = [0, 0, 0]
+    action[move] = 1
+    return action
+
+
+def bench_play_step(w, h, length, n):
+    game = make_game(w, h, length)
+    times = []
+    while len(times) < n:
+        action = safe_action(game)
+        t0 = time.perf_counter()
+        _, done, _ = game.play_step(action)
+        times.append(time.perf_counter() - t0)
+        if done or len(game.body) > 2 * length + 10:
+            game = make_game(w, h, length)
+    return measure('play_step', {'board': [w, h], 'length': length}, times)
+
+
+def bench_get_state(w, h, length, n):
+    game = make_game(w, h, length)
+    agent = Agent()
+    times = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        agent.get_state(game)
+        times.append(time.perf_counter() - t0)
+    return measure('get_state', {'board': [w, h], 'length': length}, times)
+
+
+def bench_get_action(n):
+    agent = Agent()
+    agent.n_games = 1000 # past exploration: every call runs the model
+    states = np.random.randint(0, 2, (n, 11))
+    times = []
+    for state in states:
+        t0 = time.perf_counter()
+        agent.get_action(state)
+        times.append(time.perf_counter() - t0)
+    return measure('get_action', {}, times)
+
+
+def random_transitions(n):
+    states = np.random.randint(0, 2, (n, 11)).astype(np.uint8)
+    actions = np.eye(3, dtype=np.uint8)[np.random.randint(0, 3, n)]
+    rewards = np.random.choice(np.array([-10, 0, 10], dtype=np.int8), n)
+    next_states = np.random.randint(0, 2, (n, 11)).astype(np.uint8)
+    dones = np.random.random(n) < 0.05
+    return states, actions, rewards, next_states, dones
+
+
+def bench_train_step(batch, n):
+    agent = Agent()
+    memory = ReplayMemory(batch, batch_size=batch)
+    memory.push_batch(*random_transitions(batch))
+    times = []
+    for _ in range(n):
+        if batch == 1:
+            # what train_short_memory gets from train()
+            state, action, reward, next_state, done = (a[0] for a in random_transitions(1))
+            args = (state.astype(int), action.tolist(), int(reward), next_state.astype(int), bool(done))
+        else:
+            args = memory.sample(batch)
+        t0 = time.perf_counter()
+        agent.trainer.train_step(*args)
+        times.append(time.perf_counter() - t0)
+    return measure('train_step', {'batch': batch}, times)
+
+
+def bench_replay_sample(prioritized, n):
+    if prioritized:
+        memory = PrioritizedReplayMemory(MAX_MEMORY, batch_size=BATCH_SIZE, seed=0)
+    else:
+        memory = ReplayMemory(MAX_MEMORY, batch_size=BATCH_SIZE, seed=0)
+    memory.push_batch(*random_transitions(MAX_MEMORY))
+    times = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        if prioritized:
+            _, idx, _ = memory.sample_with_weights(BATCH_SIZE)
+        else:
+            memory.sample(BATCH_SIZE)
+        times.append(time.perf_counter() - t0)
+        if prioritized:
+            memory.update_priorities(idx, np.random.random(len(idx)))
+    return measure('replay_sample', {'prioritized': prioritized, 'capacity': MAX_MEMORY, 'batch': BATCH_SIZE}, times)
+
+
+def bench_rival_move(rivals, n):
+    # the model half of move_ai_snake: one batched prediction per tick
+    names = ['blue' if i % 2 == 0 else 'orange' for i in range(rivals)]
+    registry.predict_moves(names, np.zeros((rivals, 11))) # load the models first
+    times = []
+    for _ in range(n):
+        states = np.random.randint(0, 2, (rivals, 11)).tolist()
+        t0 = time.perf_counter()
+        registry.predict_moves(names, states)
+        times.append(time.perf_counter() - t0)
+    return measure('rival_move', {'rivals': rivals}, times)
+
+
+def bench_vec_step(n_envs, n):
+    env = VecSnakeEnv(n_envs, seed=0)
+    times = []
+    for _ in range(n):
+        actions = np.random.randint(0, 3, n_envs)
+        t0 = time.perf_counter()
+        env.step(actions)
+        times.append(time.perf_counter() - t0)
+    result = measure('vec_env_step', {'envs': n_envs}, times)
+    result['steps_per_sec'] *= n_envs # game steps, not calls
+    return result
+
+
+def run(quick=False):
+    n = 500 if quick else 5000
+    results = []
+    for w, h in BOARDS:
+        for length in LENGTHS:
+            results.append(bench_play_step(w, h, length, n))
+            results.append(bench_get_state(w, h, length, n))
+    results.append(bench_get_action(n))
+    results.append(bench_train_step(1, n))
+    results.append(bench_train_step(BATCH_SIZE, n // 25))
+    results.append(bench_replay_sample(False, n // 10))
+    results.append(bench_replay_sample(True, n // 10))
+    for rivals in RIVALS:
+        results.append(bench_rival_move(rivals, n))
+    results.append(bench_vec_step(64, n // 5))
+    return results
+
+
+def result_key(result):
+    return result['name'] + json.dumps(result['params'], sort_keys=True)
+
+
+def compare(results, baseline, threshold=REGRESSION):
+    """
+    Compares median latencies against a baseline run.
+
+    Returns:
+        list: (result, baseline_result, ratio) for every result slower than
+        the baseline by more than threshold.
+    """
+
+    base = {result_key(r): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        old = base.get(result_key(result))
+        if old is None:
+            continue
+        ratio = result['p50_us'] / old['p50_us']
+        if ratio > 1 + threshold:
+            regressions.append((result, old, ratio))
+    return regressions
+
+
+def print_results(results):
+    for r in results:
+        params = ' '.join(f"{k}={v}" for k, v in r['params'].items())
+        print(f"{r['name']:<14} {params:<36} {r['steps_per_sec']:>12.0f}/s "
+              f"p50 {r['p50_us']:>9.1f}us  p90 {r['p90_us']:>9.1f}us  p99 {r['p99_us']:>9.1f}us")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the simulation, feature, training and inference hot paths')
+    parser.add_argument('--quick', action='store_true', help='fewer calls per benchmark')
+    parser.add_argument('--out', default=None, help='write the results to this JSON file')
+    parser.add_argument('--baseline', default=None, help='JSON results to compare against')
+    parser.add_argument('--threshold', type=float, default=REGRESSION,
+                        help='allowed median slowdown against the baseline, e.g. 0.1 for 10%%')
+    args = parser.parse_args()
+
+    random.seed(0)
+    np.random.seed(0)
+    torch.manual_seed(0)
+    torch.set_num_threads(1) # steadier numbers
+
+    results = run(args.quick)
+    print_results(results)
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'torch': torch.__version__,
+                'numpy': np.__version__,
+                'machine': platform.machine(),
+                'results': results,
+            }, f, indent=2)
+        print('Wrote', args.out)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for result, old, ratio in regressions:
+            print(f"REGRESSION {result['name']} {result['params']}: "
+                  f"p50 {old['p50_us']:.1f}us -> {result['p50_us']:.1f}us ({ratio:.2f}x)")
+        if regressions:
+            raise SystemExit(1)
+        print('No regressions against', args.baseline)
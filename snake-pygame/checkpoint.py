@@ -0,0 +1,124 @@
+import atexit
+import copy
+import os
+import queue
+import random
+import threading
+
+import numpy as np
+import torch
+
+SNAPSHOT_NAME = 'snapshot.pth'
+
+
+class CheckpointWriter:
+    """
+    Writes checkpoints from a background thread.
+
+    The training loop only copies the tensors and queues them. The thread
+    saves to a temporary file and renames it into place, so a crash never
+    leaves a half-written checkpoint. Model checkpoints written through
+    save_model() follow the retention rules: the keep_top best scores and
+    the keep_latest most recent are kept and the rest are deleted. Files
+    this writer did not create are never touched.
+    """
+
+    def __init__(self, folder='./model', keep_top=5, keep_latest=2):
+        self.folder = folder
+        self.keep_top = keep_top
+        self.keep_latest = keep_latest
+        os.makedirs(self.folder, exist_ok=True)
+
+        self._saved = [] # (score, seq, path) of retained model checkpoints
+        self._seq = 0
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='checkpoint-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def save_model(self, model, file_name, score):
+        state = {k: v.detach().clone() for k, v in model.state_dict().items()}
+        self._queue.put((os.path.join(self.folder, file_name), state, score))
+
+    def save_snapshot(self, snapshot, file_name=SNAPSHOT_NAME):
+        # snapshots are overwritten in place and never pruned
+        self._queue.put((os.path.join(self.folder, file_name), snapshot, None))
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            path, state, score = item
+            tmp_path = path + '.tmp'
+            torch.save(state, tmp_path)
+            os.replace(tmp_path, path)
+            if score is not None:
+                self._retain(path, score)
+
+    def _retain(self, path, score):
+        self._seq += 1
+        self._saved.append((score, self._seq, path))
+        best = sorted(self._saved, reverse=True)[:self.keep_top]
+        latest = sorted(self._saved, key=lambda s: s[1], reverse=True)[:self.keep_latest]
+        keep = set(best) | set(latest)
+        for saved in self._saved:
+            if saved not in keep and os.path.exists(saved[2]):
+                os.remove(saved[2])
+        self._saved = [saved for saved in self._saved if saved in keep]
+
+
+def training_snapshot(agent, game=None, **counters):
+    """
+    Copies everything train() needs to resume: model and Adam state, replay
+    memory, RNG states, n_games and any extra counters (record, total_score).
+    With a SnakeGameAI given, its episode seeds are saved too, so a seeded
+    run resumes with the same episodes.
+    """
+
+    snapshot = {
+        'model': {k: v.detach().clone() for k, v in agent.model.state_dict().items()},
+        'optimizer': copy.deepcopy(agent.trainer.optimizer.state_dict()),
+        'memory': agent.memory.state_dict(),
+        'rng': {
+            'python': random.getstate(),
+            'numpy': np.random.get_state(),
+            'torch': torch.get_rng_state(),
+        },
+        'n_games': agent.n_games,
+        'counters': counters,
+    }
+    if game is not None:
+        snapshot['game'] = game.seed_state()
+    return snapshot
+
+
+def restore_snapshot(path, agent, game=None):
+    """
+    Loads a snapshot written by training_snapshot() into agent, and into
+    game when both the snapshot and the call have one.
+
+    Returns:
+        dict: The extra counters that were stored with it.
+    """
+
+    snapshot = torch.load(path, map_location=torch.device('cpu'), weights_only=False)
+    agent.model.load_state_dict(snapshot['model'])
+    agent.trainer.optimizer.load_state_dict(snapshot['optimizer'])
+    agent.memory.load_state_dict(snapshot['memory'])
+    random.setstate(snapshot['rng']['python'])
+    np.random.set_state(snapshot['rng']['numpy'])
+    torch.set_rng_state(snapshot['rng']['torch'])
+    agent.n_games = snapshot['n_games']
+    if game is not None and 'game' in snapshot:
+        game.load_seed_state(snapshot['game'])
+    return snapshot['counters']
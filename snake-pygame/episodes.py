@@ -0,0 +1,140 @@
+import argparse
+import atexit
+import os
+import struct
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from game import SnakeGameAI
+
+# one record per episode: header, then the actions packed 4 to a byte
+# seed, board width, board height, steps, score
+HEADER = struct.Struct('<IHHIH')
+
+Episode = namedtuple('Episode', 'seed, w, h, actions, score')
+Episode.__doc__ = """
+A finished SnakeGameAI episode: the seed it was reset with, the board
+size, the action index of every step (0 straight, 1 right, 2 left) as
+bytes and the final score. The game is deterministic given the seed, so
+this is all it takes to play the episode again.
+"""
+
+
+def from_game(game, score):
+    # call before game.reset(), which starts the next episode's record
+    return Episode(game.seed, game.w, game.h, bytes(game.actions), score)
+
+
+def pack_actions(actions):
+    """
+    Packs action indices (0, 1 or 2) into 2 bits each.
+
+    Returns:
+        bytes: (len(actions) + 3) // 4 bytes, first action in the low bits.
+    """
+
+    codes = np.frombuffer(bytes(actions), dtype=np.uint8)
+    codes = np.concatenate([codes, np.zeros(-len(codes) % 4, dtype=np.uint8)])
+    packed = codes[0::4] | codes[1::4] << 2 | codes[2::4] << 4 | codes[3::4] << 6
+    return packed.tobytes()
+
+
+def unpack_actions(data, n):
+    packed = np.frombuffer(data, dtype=np.uint8)
+    codes = np.stack([packed & 3, packed >> 2 & 3, packed >> 4 & 3, packed >> 6 & 3], axis=1)
+    return codes.reshape(-1)[:n].tobytes()
+
+
+class EpisodeWriter:
+    """
+    Appends episodes to a binary file, about a quarter of a byte per step.
+
+    Records are written through the file's buffer; close() (also run at
+    interpreter exit) flushes what is left.
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._file = open(path, 'ab')
+        atexit.register(self.close)
+
+    def write(self, episode):
+        self._file.write(HEADER.pack(episode.seed, episode.w, episode.h, len(episode.actions), episode.score))
+        self._file.write(pack_actions(episode.actions))
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+        atexit.unregister(self.close)
+
+
+def read_episodes(path):
+    """
+    Yields the episodes recorded in path, in the order they were written.
+    """
+
+    with open(path, 'rb') as f:
+        while True:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                return # end of file, or a record cut short by a crash
+            seed, w, h, steps, score = HEADER.unpack(header)
+            data = f.read((steps + 3) // 4)
+            if len(data) < (steps + 3) // 4:
+                return
+            yield Episode(seed, w, h, unpack_actions(data, steps), score)
+
+
+def replay(episode, render=False, speed=0):
+    """
+    Plays a recorded episode again, step by step.
+
+    Args:
+        episode (Episode): The episode to replay.
+        render (bool): Show the game in a window instead of running headless.
+        speed (int): Frames per second when rendering, 0 to run uncapped.
+
+    Returns:
+        SnakeGameAI: The game after the last step.
+
+    Raises:
+        ValueError: If the replay does not end where the recording did,
+        i.e. the game is not deterministic any more.
+    """
+
+    game = SnakeGameAI(episode.w, episode.h, headless=not render)
+    game.speed = speed
+    game.reset(seed=episode.seed)
+    one_hot = ([1, 0, 0], [0, 1, 0], [0, 0, 1])
+    done = False
+    for step, action in enumerate(episode.actions):
+        if done:
+            raise ValueError(f"Replay of seed {episode.seed} ended at step {step} "
+                             f"of {len(episode.actions)}")
+        _, done, _ = game.play_step(one_hot[action])
+    if not done or game.score != episode.score:
+        raise ValueError(f"Replay of seed {episode.seed} scored {game.score}, recorded {episode.score}")
+    return game
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Replay recorded SnakeGameAI episodes')
+    parser.add_argument('path', help='episode file written by agent.py --record')
+    parser.add_argument('--episode', type=int, default=None, help='replay only this episode (0 is the first)')
+    parser.add_argument('--render', action='store_true', help='show the replay in a window')
+    parser.add_argument('--speed', type=int, default=0, help='frames per second when rendering, 0 for uncapped')
+    args = parser.parse_args()
+
+    for i, episode in enumerate(read_episodes(args.path)):
+        if args.episode is not None and i != args.episode:
+            continue
+        t0 = time.perf_counter()
+        replay(episode, args.render, args.speed)
+        elapsed = time.perf_counter() - t0
+        print(f"Episode {i}: seed {episode.seed} score {episode.score} "
+              f"{len(episode.actions)} steps replayed in {elapsed * 1000:.1f}ms")
@@ -0,0 +1,101 @@
+"""
+The 11 state features every policy is trained and played with, in order:
+
+    danger straight, danger right, danger left,
+    moving left, moving right, moving up, moving down,
+    food left, food right, food up, food down
+
+Coordinates are grid cells with y pointing down. danger(d) tells whether
+the cell next to the head in absolute direction d is blocked (off the
+board or covered by a body).
+"""
+
+import numpy as np
+
+from grid import DX, DY
+
+# clock-wise order used by SnakeGameAI._move: right, down, left, up
+RIGHT, DOWN, LEFT, UP = 0, 1, 2, 3
+
+# rows of the move-direction features (dir_l, dir_r, dir_u, dir_d) by direction
+DIRECTION_FEATURES = np.array([
+    [0, 1, 0, 0], # right
+    [0, 0, 0, 1], # down
+    [1, 0, 0, 0], # left
+    [0, 0, 1, 0], # up
+], dtype=int)
+_DIRECTION_TUPLES = [tuple(row) for row in DIRECTION_FEATURES.tolist()]
+
+TURTLE_DIRECTIONS = {"right": RIGHT, "down": DOWN, "left": LEFT, "up": UP}
+
+
+def state(direction, danger, head, food):
+    """
+    Features of one board.
+
+    Args:
+        direction (int): Clock-wise direction index of the snake.
+        danger (callable): danger(d) -> bool for the cell beside the head.
+        head (tuple): Head cell (x, y).
+        food (tuple): Food cell (x, y).
+
+    Returns:
+        np.ndarray: The 11 features as ints.
+    """
+
+    hx, hy = head
+    fx, fy = food
+    dir_l, dir_r, dir_u, dir_d = _DIRECTION_TUPLES[direction]
+    return np.array([
+        danger(direction),
+        danger((direction + 1) % 4),
+        danger((direction - 1) % 4),
+        dir_l, dir_r, dir_u, dir_d,
+        fx < hx, fx > hx, fy < hy, fy > hy,
+    ], dtype=int)
+
+
+def batch_state(direction, danger, head_x, head_y, food_x, food_y):
+    """
+    Features of n boards at once.
+
+    Same as state() with every argument an (n,) array and danger(d)
+    returning an (n,) bool array for the cells beside the n heads.
+
+    Returns:
+        np.ndarray: (n, 11) int features.
+    """
+
+    out = np.empty((len(direction), 11), dtype=int)
+    out[:, 0] = danger(direction)
+    out[:, 1] = danger((direction + 1) % 4)
+    out[:, 2] = danger((direction - 1) % 4)
+    out[:, 3:7] = DIRECTION_FEATURES[direction]
+    out[:, 7] = food_x < head_x
+    out[:, 8] = food_x > head_x
+    out[:, 9] = food_y < head_y
+    out[:, 10] = food_y > head_y
+    return out
+
+
+def turtle_state(head, direction, food, blocked, unit=20):
+    """
+    Features of a snake on a turtle board.
+
+    Args:
+        head (tuple): Head position in turtle pixels (y pointing up).
+        direction (str): Heading name ("right", "down", "left" or "up").
+        food (tuple): Food position in turtle pixels.
+        blocked (callable): blocked(x, y) -> bool for a turtle cell
+            (pixels // unit, y pointing up).
+        unit (int): Size of a cell in pixels.
+    """
+
+    x, y = round(head[0] / unit), round(head[1] / unit)
+    fx, fy = round(food[0] / unit), round(food[1] / unit)
+
+    def danger(d):
+        # flip DY back to turtle's y-up cells
+        return blocked(x + DX[d], y - DY[d])
+
+    return state(TURTLE_DIRECTIONS[direction], danger, (x, -y), (fx, -fy))
@@ -0,0 +1,107 @@
+import random
+
+
+def to_cell(pos, unit=20):
+    """
+    Converts a turtle/pixel position to the (x, y) grid cell it sits on.
+
+    Args:
+        pos (tuple): The (x, y) position to convert.
+        unit (int): The size of each grid cell.
+
+    Returns:
+        tuple: The grid cell as (x, y).
+    """
+
+    return (int(round(pos[0] / unit)), int(round(pos[1] / unit)))
+
+
+class FoodSampler:
+    """
+    Tracks the free cells of a cols x rows board and samples one in O(1).
+
+    Cells are (x, y) grid coordinates starting at (x0, y0), so turtle boards
+    centred on (0, 0) can use negative coordinates. Whatever food must not
+    spawn on (snake bodies, rival snakes, obstacles) is marked with occupy()
+    and handed back with release(); a cell is free again once every occupy()
+    on it has been released.
+    """
+
+    def __init__(self, cols, rows, x0=0, y0=0, rng=None):
+        self.cols = cols
+        self.rows = rows
+        self.x0 = x0
+        self.y0 = y0
+        self.rng = rng if rng is not None else random
+        self.clear()
+
+    def clear(self):
+        size = self.cols * self.rows
+        # free holds the free cell indices; slot[i] is the position of cell i in free
+        self.free = list(range(size))
+        self.slot = list(range(size))
+        self.counts = [0] * size
+
+    def _index(self, x, y):
+        x -= self.x0
+        y -= self.y0
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            return y * self.cols + x
+        return -1
+
+    def occupy(self, x, y):
+        i = self._index(x, y)
+        if i == -1:
+            return
+        self.counts[i] += 1
+        if self.counts[i] == 1:
+            # swap the cell with the last free one and drop it
+            pos = self.slot[i]
+            last = self.free[-1]
+            self.free[pos] = last
+            self.slot[last] = pos
+            self.free.pop()
+            self.slot[i] = -1
+
+    def release(self, x, y):
+        i = self._index(x, y)
+        if i == -1 or self.counts[i] == 0:
+            return
+        self.counts[i] -= 1
+        if self.counts[i] == 0:
+            self.slot[i] = len(self.free)
+            self.free.append(i)
+
+    def is_free(self, x, y):
+        i = self._index(x, y)
+        return i != -1 and self.counts[i] == 0
+
+    def __len__(self):
+        return len(self.free)
+
+    def sample(self):
+        """
+        Returns a uniformly random free cell as (x, y), or None if the board is full.
+        """
+
+        if not self.free:
+            return None
+        i = self.free[self.rng.randrange(len(self.free))]
+        return (self.x0 + i % self.cols, self.y0 + i // self.cols)
+
+    def sample_avoiding(self, cells):
+        """
+        Samples a free cell that is also not one of cells.
+
+        Used for things that move every tick (like a turtle snake) and are
+        only worth marking when food actually has to spawn.
+        """
+
+        cells = list(cells)
+        for x, y in cells:
+            self.occupy(x, y)
+        try:
+            return self.sample()
+        finally:
+            for x, y in cells:
+                self.release(x, y)
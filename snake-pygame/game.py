@@ -1,13 +1,23 @@
 import pygame
 import random
 from enum import Enum
-from collections import namedtuple
-import numpy as np
+from collections import namedtuple, deque
+from grid import OccupancyGrid, DX, DY
+from food import FoodSampler
 
-pygame.init()
-font = pygame.font.Font('arial.ttf', 25)
+font = None # loaded by the first game that renders
 #font = pygame.font.SysFont('arial', 25)
 
+
+def _init_pygame():
+    # only rendering games start SDL: pygame.init() installs handlers that
+    # turn SIGTERM/SIGINT into a QUIT event, and headless games never read
+    # events, so a headless run would ignore kill and timeout
+    global font
+    if font is None:
+        pygame.init()
+        font = pygame.font.Font('arial.ttf', 25)
+
 # reset 
 # reward
 # play(action) -> direction
@@ -22,6 +32,8 @@ class Direction(Enum):
     
 Point = namedtuple('Point', 'x, y')
 
+CLOCK_WISE = [Direction.RIGHT, Direction.DOWN, Direction.LEFT, Direction.UP]
+
 # rgb colors
 WHITE = (255, 255, 255)
 RED = (200,0,0)
@@ -32,50 +44,128 @@ BLACK = (0,0,0)
 BLOCK_SIZE = 20
 SPEED = 20
 
+class SnakeView:
+    """
+    Read-only view of the body as pixel Points, head first.
+
+    The game stores the body as integer cells in a deque; this keeps
+    game.snake[0], game.snake[1:], len(game.snake) and iteration working
+    for callers.
+    """
+
+    def __init__(self, body):
+        self._body = body
+
+    def __len__(self):
+        return len(self._body)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            # game.snake[1:] and the like: a list, as when the body was one
+            return [Point(x * BLOCK_SIZE, y * BLOCK_SIZE) for x, y in list(self._body)[idx]]
+        x, y = self._body[idx]
+        return Point(x * BLOCK_SIZE, y * BLOCK_SIZE)
+
+    def __iter__(self):
+        for x, y in self._body:
+            yield Point(x * BLOCK_SIZE, y * BLOCK_SIZE)
+
+    def __contains__(self, pt):
+        return (int(pt.x) // BLOCK_SIZE, int(pt.y) // BLOCK_SIZE) in self._body
+
+
 class SnakeGameAI: 
     
-    def __init__(self, w=640, h=480):
+    def __init__(self, w=640, h=480, headless=False, seed=None):
         self.w = w
         self.h = h
-        # init display
-        self.display = pygame.display.set_mode((self.w, self.h))
-        pygame.display.set_caption('Snake')
-        self.clock = pygame.time.Clock()
+        self.grid = OccupancyGrid(self.w // BLOCK_SIZE, self.h // BLOCK_SIZE)
+        # every episode gets its own seed, drawn from a generator seeded
+        # with seed: a seeded game repeats the same episodes, and any
+        # episode can be replayed from its seed and its actions
+        self._seeds = random.Random(seed)
+        self.rng = random.Random()
+        self.food_sampler = FoodSampler(self.grid.cols, self.grid.rows, rng=self.rng)
+        self.speed = SPEED # frame cap when rendering, 0 for none
+        # headless: no display, no event pump, no rendering, no frame cap
+        self.headless = headless
+        self.display = None
+        self.clock = None
+        if not self.headless:
+            # init display
+            _init_pygame()
+            self.display = pygame.display.set_mode((self.w, self.h))
+            pygame.display.set_caption('Snake')
+            self.clock = pygame.time.Clock()
+            self._init_sprites()
         self.reset()
     
-    def reset(self):
+    def reset(self, seed=None):
+        # seed the episode: all of its randomness comes from self.rng
+        self.seed = self._seeds.getrandbits(32) if seed is None else seed
+        self.rng.seed(self.seed)
+        self.actions = bytearray() # action index of every step, see _move
+
         # init game state
         self.direction = Direction.RIGHT
         
-        self.head = Point(self.w/2, self.h/2)
-        self.snake = [self.head, 
-                      Point(self.head.x-BLOCK_SIZE, self.head.y),
-                      Point(self.head.x-(2*BLOCK_SIZE), self.head.y)]
+        # body cells (x, y), head first: O(1) push at the head and pop at the tail
+        x, y = self.w // 2 // BLOCK_SIZE, self.h // 2 // BLOCK_SIZE
+        self.body = deque([(x, y), (x-1, y), (x-2, y)])
+        self.snake = SnakeView(self.body)
+        self.grid.clear()
+        self.food_sampler.clear()
+        for x, y in self.body:
+            self.grid.add(self.grid.cell(x, y))
+            self.food_sampler.occupy(x, y)
         
         self.score = 0
         self.food = None
+        self.food_cell = None
         self._place_food()    
         self.frame_iteration = 0
+        self._redraw = True # next frame repaints the whole display
+
+    def seed_state(self):
+        # the current episode's seed and the generator of the next ones
+        return {'seed': self.seed, 'seeds': self._seeds.getstate()}
+
+    def load_seed_state(self, state):
+        # restarts the saved episode; the ones after it follow as they would have
+        self._seeds.setstate(state['seeds'])
+        self.reset(seed=state['seed'])
+
+    @property
+    def head(self):
+        x, y = self.body[0]
+        return Point(x * BLOCK_SIZE, y * BLOCK_SIZE)
 
     def _place_food(self):
-        x = random.randint(0, (self.w-BLOCK_SIZE )//BLOCK_SIZE )*BLOCK_SIZE 
-        y = random.randint(0, (self.h-BLOCK_SIZE )//BLOCK_SIZE )*BLOCK_SIZE
-        self.food = Point(x, y)
-        if self.food in self.snake:
-            self._place_food()
+        # O(1) pick among the cells the snake does not cover
+        cell = self.food_sampler.sample()
+        if cell is None:
+            return # the snake fills the board
+        x, y = cell
+        self.food_cell = (x, y)
+        self.food = Point(x * BLOCK_SIZE, y * BLOCK_SIZE)
         
     def play_step(self, action):
         self.frame_iteration += 1
         # 1. collect user input
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                quit()
+        if not self.headless:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    quit()
             
         
         # 2. move
         self._move(action) # update the head
-        self.snake.insert(0, self.head)
+        x, y = self.body[0]
+        head_cell = self.grid.cell(x, y)
+        if head_cell != -1:
+            self.grid.add(head_cell)
+            self.food_sampler.occupy(x, y)
         
         # 3. check if game over
         reward = 0
@@ -86,71 +176,124 @@ class SnakeGameAI:
             return reward, game_over, self.score
             
         # 4. place new food or just move
-        if self.head == self.food:
+        if self.body[0] == self.food_cell:
             self.score += 1
             reward = 10
             self._place_food()
         else:
-            self.snake.pop()
+            x, y = self.body.pop()
+            self.grid.remove(self.grid.cell(x, y))
+            self.food_sampler.release(x, y)
         
         # 5. update ui and clock
-        self._update_ui()
-        self.clock.tick(SPEED)
+        if not self.headless:
+            self._update_ui()
+            self.clock.tick(self.speed)
         # 6. return game over and score
         return reward, game_over, self.score
     
     def is_collision(self, pt=None):
         if pt is None:
-            pt = self.head    
-        # hits boundary
-        if pt.x > self.w - BLOCK_SIZE or pt.x < 0 or pt.y > self.h - BLOCK_SIZE or pt.y < 0:
+            # the head's cell: off the board, or covered by a segment as well
+            cell = self.grid.cell(*self.body[0])
+            return cell == -1 or self.grid.counts[cell] > 1
+        # hits boundary: the grid has no cell there
+        x, y = int(pt.x) // BLOCK_SIZE, int(pt.y) // BLOCK_SIZE
+        cell = self.grid.cell(x, y)
+        if cell == -1:
             return True
-        # hits itself
-        if pt in self.snake[1:]:
-            return True
-        
-        return False
+        # hits itself: O(1) lookup, the head's own cell only counts twice
+        return self.grid.counts[cell] > ((x, y) == self.body[0])
         
+    def _init_sprites(self):
+        # tiles drawn once and blitted from then on
+        self._segment_tile = pygame.Surface((BLOCK_SIZE, BLOCK_SIZE)).convert()
+        self._segment_tile.fill(BLUE1)
+        pygame.draw.rect(self._segment_tile, BLUE2, pygame.Rect(4, 4, 12, 12))
+        self._food_tile = pygame.Surface((BLOCK_SIZE, BLOCK_SIZE)).convert()
+        self._food_tile.fill(RED)
+        self._score_text = None
+        self._shown_score = None
+        self._text_rect = pygame.Rect(0, 0, 0, 0)
+
+    def _cell_rect(self, cell):
+        x, y = cell
+        return pygame.Rect(x * BLOCK_SIZE, y * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
+
     def _update_ui(self):
-        self.display.fill(BLACK)
-        
-        for pt in self.snake:
-            pygame.draw.rect(self.display, BLUE1, pygame.Rect(pt.x, pt.y, BLOCK_SIZE, BLOCK_SIZE))
-            pygame.draw.rect(self.display, BLUE2, pygame.Rect(pt.x+4, pt.y+4, 12, 12))
-            
-        pygame.draw.rect(self.display, RED, pygame.Rect(self.food.x, self.food.y, BLOCK_SIZE, BLOCK_SIZE))
-        
-        text = font.render("Score: " + str(self.score), True, WHITE)
-        self.display.blit(text, [0, 0])
-        pygame.display.flip()
-        
+        """
+        Draws the frame by updating only what changed since the last one.
+
+        A step only moves the head and the tail and sometimes the food, so
+        those cells are blitted from pre-rendered tiles and only their
+        rectangles are pushed to the screen. The score text is re-rendered
+        when the score changes; the area under it is repainted whenever a
+        changed cell touches it, keeping the text on top. reset() asks for
+        a full repaint.
+        """
+
+        score_changed = self.score != self._shown_score
+        if score_changed:
+            self._score_text = font.render("Score: " + str(self.score), True, WHITE)
+            self._shown_score = self.score
+
+        if self._redraw:
+            self.display.fill(BLACK)
+            for cell in self.body:
+                self.display.blit(self._segment_tile, self._cell_rect(cell))
+            if self.food_cell is not None:
+                self.display.blit(self._food_tile, self._cell_rect(self.food_cell))
+            self._text_rect = self.display.blit(self._score_text, (0, 0))
+            pygame.display.flip()
+            self._redraw = False
+        else:
+            dirty = []
+            if self.body[-1] != self._shown_tail:
+                # the tail moved on: clear the cell it left
+                dirty.append(self.display.fill(BLACK, self._cell_rect(self._shown_tail)))
+            dirty.append(self.display.blit(self._segment_tile, self._cell_rect(self.body[0])))
+            if self.food_cell != self._shown_food and self.food_cell is not None:
+                dirty.append(self.display.blit(self._food_tile, self._cell_rect(self.food_cell)))
+
+            text_rect = self._score_text.get_rect()
+            if score_changed or text_rect.collidelist(dirty) != -1:
+                dirty.append(self._draw_text_area(text_rect))
+            pygame.display.update(dirty)
+
+        self._shown_tail = self.body[-1]
+        self._shown_food = self.food_cell
+
+    def _draw_text_area(self, text_rect):
+        # repaint the cells under the old and new text, then the text on top
+        area = self._text_rect.union(text_rect)
+        self.display.fill(BLACK, area)
+        for y in range(area.top // BLOCK_SIZE, (area.bottom - 1) // BLOCK_SIZE + 1):
+            for x in range(area.left // BLOCK_SIZE, (area.right - 1) // BLOCK_SIZE + 1):
+                if (x, y) == self.food_cell:
+                    self.display.blit(self._food_tile, self._cell_rect((x, y)))
+                elif self.grid.is_occupied(self.grid.cell(x, y)):
+                    self.display.blit(self._segment_tile, self._cell_rect((x, y)))
+        self._text_rect = self.display.blit(self._score_text, (0, 0))
+        return area
+
     def _move(self, action):
         # [straight, right, left]
 
-        clock_wise = [Direction.RIGHT, Direction.DOWN, Direction.LEFT, Direction.UP]
-        idx = clock_wise.index(self.direction)
+        idx = CLOCK_WISE.index(self.direction)
 
-        if np.array_equal(action, [1, 0, 0]):
-            new_dir = clock_wise[idx] # no change
-        elif np.array_equal(action, [0, 1, 0]):
-            next_idx = (idx + 1) % 4
-            new_dir = clock_wise[next_idx] # right turn r -> d -> l -> u
+        move = tuple(action)
+        if move == (1, 0, 0):
+            new_idx = idx # no change
+            self.actions.append(0)
+        elif move == (0, 1, 0):
+            new_idx = (idx + 1) % 4 # right turn r -> d -> l -> u
+            self.actions.append(1)
         else: # [0, 0, 1]
-            next_idx = (idx - 1) % 4
-            new_dir = clock_wise[next_idx] # left turn r -> u -> l -> d
-
-        self.direction = new_dir    
-
-        x = self.head.x
-        y = self.head.y
-        if self.direction == Direction.RIGHT:
-            x += BLOCK_SIZE
-        elif self.direction == Direction.LEFT:
-            x -= BLOCK_SIZE
-        elif self.direction == Direction.DOWN:
-            y += BLOCK_SIZE
-        elif self.direction == Direction.UP:
-            y -= BLOCK_SIZE
-            
-        self.head = Point(x, y)
-            
\ No newline at end of file
+            new_idx = (idx - 1) % 4 # left turn r -> u -> l -> d
+            self.actions.append(2)
+
+        self.direction = CLOCK_WISE[new_idx]
+
+        # push the new head cell; the tail is popped in play_step
+        x, y = self.body[0]
+        self.body.appendleft((x + DX[new_idx], y + DY[new_idx]))
@@ -0,0 +1,53 @@
+from functools import cached_property
+
+# clock-wise order used by SnakeGameAI._move: right, down, left, up
+DX = (1, 0, -1, 0)
+DY = (0, 1, 0, -1)
+
+
+class OccupancyGrid:
+    """
+    Segment counts for a cols x rows board, updated incrementally.
+
+    Cells are addressed by their linear index y * cols + x. The neighbour
+    table is built on first use, once per board, so the danger checks
+    next to the head are table lookups that never scan the snake body.
+    """
+
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.size = cols * rows
+        self.counts = bytearray(self.size)
+
+    @cached_property
+    def neighbours(self):
+        # neighbours[4 * cell + d] is the next cell in direction d, -1 off the board
+        table = [-1] * (4 * self.size)
+        for y in range(self.rows):
+            for x in range(self.cols):
+                cell = y * self.cols + x
+                for d in range(4):
+                    table[4 * cell + d] = self.cell(x + DX[d], y + DY[d])
+        return table
+
+    def cell(self, x, y):
+        # linear index of (x, y), or -1 if it lies outside the board
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            return y * self.cols + x
+        return -1
+
+    def neighbour(self, cell, direction):
+        return self.neighbours[4 * cell + direction]
+
+    def add(self, cell):
+        self.counts[cell] += 1
+
+    def remove(self, cell):
+        self.counts[cell] -= 1
+
+    def clear(self):
+        self.counts = bytearray(self.size)
+
+    def is_occupied(self, cell):
+        return self.counts[cell] > 0
@@ -0,0 +1,111 @@
+import importlib
+import os
+import runpy
+import signal
+import subprocess
+import sys
+import traceback
+
+# imported (and models loaded) once in the warm process, shared by every game
+PRELOAD_MODULES = ('numpy', 'pygame', 'tkinter', 'turtle', 'grid', 'food', 'registry',
+                   'features', 'turtle_render', 'turtle_board', 'levels', 'pathfinding')
+PRELOAD_MODELS = ('blue', 'orange')
+
+
+class Launcher:
+    """
+    Starts game scripts from a warm, pre-forked process.
+
+    The constructor forks a launcher process that imports PRELOAD_MODULES
+    and loads PRELOAD_MODELS, then waits for script paths on a pipe. Each
+    launch() forks that process again and runs the script in the child, so
+    a game starts without a new interpreter, imports or model loading.
+    Create it before any Tk window: the fork must not inherit a display
+    connection. Where os.fork is missing, or on macOS, where a forked child
+    cannot safely use the system frameworks the parent loaded, launch()
+    falls back to a new interpreter per game.
+    """
+
+    def __init__(self):
+        self._pipe = None
+        self._pid = None
+        if not hasattr(os, 'fork') or sys.platform == 'darwin':
+            return
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(write_fd)
+            try:
+                _serve(read_fd)
+            finally:
+                os._exit(0)
+        os.close(read_fd)
+        self._pipe = os.fdopen(write_fd, 'w')
+        self._pid = pid
+
+    def launch(self, script):
+        script = os.path.abspath(script)
+        if self._pipe is None:
+            subprocess.Popen([sys.executable, script], cwd=os.path.dirname(script))
+            return
+        self._pipe.write(script + '\n')
+        self._pipe.flush()
+
+    def close(self):
+        # EOF on the pipe stops the launcher process; running games carry on
+        if self._pipe is None:
+            return
+        self._pipe.close()
+        self._pipe = None
+        os.waitpid(self._pid, 0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _serve(read_fd):
+    # finished games are reaped automatically
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    _preload()
+    with os.fdopen(read_fd) as requests:
+        for line in requests:
+            script = line.strip()
+            if script and os.fork() == 0:
+                requests.close()
+                _run_game(script)
+
+
+def _preload():
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+    registry = sys.modules.get('registry')
+    if registry is not None:
+        for name in PRELOAD_MODELS:
+            try:
+                registry.get_model(name)
+            except FileNotFoundError:
+                pass
+
+
+def _run_game(script):
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    directory = os.path.dirname(script)
+    os.chdir(directory)
+    sys.path.insert(0, directory)
+    sys.argv = [script]
+    try:
+        runpy.run_path(script, run_name='__main__')
+    except SystemExit:
+        pass
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(0)
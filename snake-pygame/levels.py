@@ -0,0 +1,233 @@
+import argparse
+import os
+import random
+from collections import deque
+
+import numpy as np
+
+from grid import DX, DY
+
+# generated levels are cached here, one small .npz per level
+LEVEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'levels')
+
+BOUNDS = (-19, 19, -14, 14) # cells of the turtle obstacle board
+SPAWN = (0, 0)
+CORRIDOR = 5 # cells kept clear on each side of the spawn point
+DENSITY = 0.05 # share of the board covered by obstacles
+
+# the 8 cells around a cell, in ring order starting north (y up)
+RING = ((0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1))
+
+
+class Level:
+    """
+    An obstacle layout and the static data derived from it.
+
+    Arrays are indexed [y - y_min, x - x_min] over turtle cells (y up).
+    Every free cell is reachable from the spawn point, and distance holds
+    the number of moves from the spawn to each cell (-1 on obstacles), so
+    callers can ask how far food is or whether a cell is reachable
+    without searching.
+    """
+
+    def __init__(self, seed, density, bounds, spawn, obstacles, distance):
+        self.seed = seed
+        self.density = density
+        self.bounds = bounds
+        self.spawn = spawn
+        self.obstacles = obstacles
+        self.distance = distance
+
+    def cells(self):
+        # obstacle cells as (x, y)
+        x_min, _, y_min, _ = self.bounds
+        ys, xs = np.nonzero(self.obstacles)
+        return [(int(x) + x_min, int(y) + y_min) for x, y in zip(xs, ys)]
+
+    def positions(self, unit=20):
+        # obstacle turtle positions in pixels
+        return [(x * unit, y * unit) for x, y in self.cells()]
+
+    def distance_to(self, cell):
+        x_min, _, y_min, _ = self.bounds
+        return int(self.distance[cell[1] - y_min, cell[0] - x_min])
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = path + '.tmp.npz'
+        np.savez_compressed(
+            tmp,
+            meta=np.array([self.seed, *self.bounds, *self.spawn], dtype=np.int64),
+            density=np.float64(self.density),
+            shape=np.array(self.obstacles.shape),
+            obstacles=np.packbits(self.obstacles),
+            distance=self.distance,
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            seed, x_min, x_max, y_min, y_max, sx, sy = data['meta'].tolist()
+            rows, cols = data['shape'].tolist()
+            obstacles = np.unpackbits(data['obstacles'], count=rows * cols).reshape(rows, cols).astype(bool)
+            return cls(seed, float(data['density']), (x_min, x_max, y_min, y_max), (sx, sy),
+                       obstacles, data['distance'])
+
+
+def spawn_corridor(spawn=SPAWN, length=CORRIDOR):
+    # the spawn cell and a straight run of cells in each direction from it
+    x, y = spawn
+    cells = {spawn}
+    for d in range(4):
+        for i in range(1, length + 1):
+            cells.add((x + i * DX[d], y + i * DY[d]))
+    return cells
+
+
+def distances(obstacles, start):
+    """
+    Breadth-first distances from start over the free cells.
+
+    Args:
+        obstacles (np.ndarray): (rows, cols) bool, True on obstacles.
+        start (tuple): Start cell as array indices (col, row).
+
+    Returns:
+        np.ndarray: (rows, cols) int16 moves from start, -1 where unreachable.
+    """
+
+    rows, cols = obstacles.shape
+    dist = np.full((rows, cols), -1, dtype=np.int16)
+    dist[start[1], start[0]] = 0
+    frontier = deque([start])
+    while frontier:
+        x, y = frontier.popleft()
+        step = dist[y, x] + 1
+        for d in range(4):
+            nx, ny = x + DX[d], y + DY[d]
+            if 0 <= nx < cols and 0 <= ny < rows and not obstacles[ny, nx] and dist[ny, nx] == -1:
+                dist[ny, nx] = step
+                frontier.append((nx, ny))
+    return dist
+
+
+def _keeps_connected(obstacles, x, y):
+    """
+    True if putting an obstacle on the free cell (x, y) leaves the free
+    cells connected.
+
+    Free side neighbours that are joined through the ring of 8 cells
+    around (x, y) stay joined, which settles most cells locally; only when
+    the ring splits them is there a search to see whether they still meet
+    the long way round.
+    """
+
+    rows, cols = obstacles.shape
+
+    def free(cx, cy):
+        return 0 <= cx < cols and 0 <= cy < rows and not obstacles[cy, cx]
+
+    ring = [free(x + dx, y + dy) for dx, dy in RING]
+    # runs of free cells around the ring that hold a side neighbour
+    runs = 0
+    for i in range(0, 8, 2):
+        if ring[i] and not (ring[i - 1] and ring[i - 2]):
+            runs += 1
+    if runs <= 1:
+        return True
+
+    sides = [(x + dx, y + dy) for dx, dy in RING[::2] if free(x + dx, y + dy)]
+    obstacles[y, x] = True
+    try:
+        targets = set(sides[1:])
+        seen = {sides[0]}
+        frontier = deque([sides[0]])
+        while frontier and targets:
+            cx, cy = frontier.popleft()
+            for d in range(4):
+                nxt = (cx + DX[d], cy + DY[d])
+                if nxt not in seen and free(*nxt):
+                    seen.add(nxt)
+                    targets.discard(nxt)
+                    frontier.append(nxt)
+        return not targets
+    finally:
+        obstacles[y, x] = False
+
+
+def generate(seed, density=DENSITY, bounds=BOUNDS, spawn=SPAWN, corridor=CORRIDOR):
+    """
+    Generates an obstacle level; the same arguments give the same level.
+
+    Cells are tried in a seeded random order and an obstacle is kept only
+    if the free cells stay connected, so nothing is walled off, until the
+    target density is reached or no cell can be added. The spawn corridor
+    is never used.
+
+    Args:
+        seed (int): Seed of the layout.
+        density (float): Share of the board to cover with obstacles.
+        bounds (tuple): (x_min, x_max, y_min, y_max) cells of the board.
+        spawn (tuple): Spawn cell (x, y).
+        corridor (int): Cells kept clear on each side of the spawn.
+
+    Returns:
+        Level: The generated level.
+    """
+
+    x_min, x_max, y_min, y_max = bounds
+    cols, rows = x_max - x_min + 1, y_max - y_min + 1
+    obstacles = np.zeros((rows, cols), dtype=bool)
+    target = int(round(density * cols * rows))
+
+    clear = spawn_corridor(spawn, corridor)
+    candidates = [(x, y) for y in range(y_min, y_max + 1) for x in range(x_min, x_max + 1)
+                  if (x, y) not in clear]
+    random.Random(seed).shuffle(candidates)
+
+    placed = 0
+    for x, y in candidates:
+        if placed == target:
+            break
+        col, row = x - x_min, y - y_min
+        if _keeps_connected(obstacles, col, row):
+            obstacles[row, col] = True
+            placed += 1
+
+    distance = distances(obstacles, (spawn[0] - x_min, spawn[1] - y_min))
+    return Level(seed, density, bounds, spawn, obstacles, distance)
+
+
+def level_path(seed, density=DENSITY, bounds=BOUNDS, spawn=SPAWN, corridor=CORRIDOR, folder=LEVEL_DIR):
+    x_min, x_max, y_min, y_max = bounds
+    name = (f"level_{x_max - x_min + 1}x{y_max - y_min + 1}_s{seed}_d{density:g}"
+            f"_at{spawn[0]},{spawn[1]}_c{corridor}.npz")
+    return os.path.join(folder, name)
+
+
+def load_level(seed, density=DENSITY, bounds=BOUNDS, spawn=SPAWN, corridor=CORRIDOR, folder=LEVEL_DIR):
+    """
+    Returns a level from the cache, generating and caching it on first use.
+    """
+
+    path = level_path(seed, density, bounds, spawn, corridor, folder)
+    if os.path.isfile(path):
+        return Level.load(path)
+    level = generate(seed, density, bounds, spawn, corridor)
+    level.save(path)
+    return level
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate and cache obstacle levels')
+    parser.add_argument('--seeds', type=int, default=10, help='generate levels 0..seeds-1')
+    parser.add_argument('--density', type=float, default=DENSITY, help='share of the board covered by obstacles')
+    args = parser.parse_args()
+
+    for seed in range(args.seeds):
+        level = load_level(seed, args.density)
+        print(f"level {seed}: {int(level.obstacles.sum())} obstacles, "
+              f"farthest cell {int(level.distance.max())} moves from the spawn")
@@ -0,0 +1,105 @@
+import atexit
+import csv
+import os
+import threading
+
+
+class TrainingLogWriter:
+    """
+    Buffered CSV log that writes from a background thread.
+
+    write() only appends the row to an in-memory buffer. The thread flushes
+    the buffer once it holds flush_rows rows or every flush_interval
+    seconds, keeping the file open between flushes. With max_bytes set the
+    file is rotated to path.1 ... path.<backups> when it grows past that
+    size. Remaining rows are flushed on close(), which also runs at
+    interpreter exit (including exit after an uncaught exception).
+    """
+
+    def __init__(self, path, header, flush_rows=100, flush_interval=5.0, max_bytes=None, backups=5):
+        self.path = path
+        self.header = header
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+        self._rows = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._file = None
+        self._writer = None
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._thread = threading.Thread(target=self._run, name='training-log', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, row):
+        with self._lock:
+            self._rows.append(row)
+            full = len(self._rows) >= self.flush_rows
+        if full:
+            self._wake.set()
+
+    def flush(self):
+        # ask the thread to flush now
+        self._wake.set()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._write_buffered()
+        self._write_buffered()
+        if self._file is not None:
+            self._file.close()
+
+    def _write_buffered(self):
+        with self._lock:
+            rows, self._rows = self._rows, []
+        if not rows:
+            return
+        if self._file is None:
+            self._open()
+        self._writer.writerows(rows)
+        self._file.flush()
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+    def _open(self):
+        new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self._file = open(self.path, mode='a', newline='')
+        self._writer = csv.writer(self._file)
+        if new:
+            self._writer.writerow(self.header)
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
@@ -0,0 +1,235 @@
+import numpy as np
+import torch
+
+
+class ReplayMemory:
+    """
+    Replay memory backed by preallocated, fixed-size typed arrays.
+
+    Transitions are written into a ring buffer (the oldest are overwritten
+    once it is full, like deque(maxlen=...)). sample() gathers a batch into
+    reusable buffers and hands them to torch with torch.from_numpy, so no
+    per-batch Python lists or tensor copies are built.
+    """
+
+    def __init__(self, capacity, state_size=11, action_size=3, batch_size=1000, seed=None):
+        self.capacity = capacity
+        self.rng = np.random.default_rng(seed)
+        self.pos = 0
+        self.size = 0
+
+        # states are 0/1 features, actions one-hot, rewards -10/0/+10
+        self.states = np.zeros((capacity, state_size), dtype=np.uint8)
+        self.actions = np.zeros((capacity, action_size), dtype=np.uint8)
+        self.rewards = np.zeros(capacity, dtype=np.int8)
+        self.next_states = np.zeros((capacity, state_size), dtype=np.uint8)
+        self.dones = np.zeros(capacity, dtype=np.bool_)
+
+        # reused for every batch; sample() returns tensors that share them
+        self._batch = tuple(np.zeros((batch_size,) + a.shape[1:], dtype=a.dtype) for a in self._arrays())
+
+    def _arrays(self):
+        return (self.states, self.actions, self.rewards, self.next_states, self.dones)
+
+    def __len__(self):
+        return self.size
+
+    def push(self, state, action, reward, next_state, done):
+        i = self.pos
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self.pos = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return i
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        n = len(states)
+        idx = (self.pos + np.arange(n)) % self.capacity
+        for array, values in zip(self._arrays(), (states, actions, rewards, next_states, dones)):
+            array[idx] = values
+        self.pos = (self.pos + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+        return idx
+
+    def sample_indices(self, batch_size):
+        if self.size > batch_size:
+            return self.rng.choice(self.size, batch_size, replace=False)
+        return np.arange(self.size)
+
+    def gather(self, idx):
+        """
+        Copies the rows idx into the batch buffers.
+
+        Returns:
+            tuple: (states, actions, rewards, next_states, dones) tensors that
+            share memory with the buffers; they are overwritten by the next call.
+        """
+
+        n = len(idx)
+        if n > len(self._batch[0]):
+            self._batch = tuple(np.zeros((n,) + a.shape[1:], dtype=a.dtype) for a in self._arrays())
+        batch = []
+        for array, buf in zip(self._arrays(), self._batch):
+            out = buf[:n]
+            np.take(array, idx, axis=0, out=out)
+            batch.append(torch.from_numpy(out))
+        return tuple(batch)
+
+    def sample(self, batch_size):
+        return self.gather(self.sample_indices(batch_size))
+
+    def state_dict(self):
+        # copies of the filled rows, the write position and the sampling RNG
+        n = self.size
+        return {
+            'pos': self.pos,
+            'size': n,
+            'arrays': tuple(a[:n].copy() for a in self._arrays()),
+            'rng': self.rng.bit_generator.state,
+        }
+
+    def load_state_dict(self, state):
+        n = state['size']
+        if n > self.capacity:
+            raise ValueError(f"saved memory holds {n} transitions, capacity is {self.capacity}")
+        for array, values in zip(self._arrays(), state['arrays']):
+            array[:n] = values
+        self.pos = state['pos'] % self.capacity
+        self.size = n
+        self.rng.bit_generator.state = state['rng']
+
+
+class SumTree:
+    """
+    Binary sum-tree over leaf priorities.
+
+    Node i has children 2i and 2i + 1 and the root is node 1, so the leaves
+    live at [size, 2 * size). Both the update and the prefix-sum search are
+    O(log n) and work on whole batches of indices at once.
+    """
+
+    def __init__(self, capacity):
+        self.size = 1
+        while self.size < capacity:
+            self.size *= 2
+        self.tree = np.zeros(2 * self.size, dtype=np.float64)
+
+    @property
+    def total(self):
+        return self.tree[1]
+
+    def get(self, idx):
+        return self.tree[np.asarray(idx) + self.size]
+
+    def set(self, i, priority):
+        # scalar path used for every single push
+        node = i + self.size
+        tree = self.tree
+        tree[node] = priority
+        node //= 2
+        while node >= 1:
+            tree[node] = tree[2 * node] + tree[2 * node + 1]
+            node //= 2
+
+    def update(self, idx, priorities):
+        nodes = np.asarray(idx) + self.size
+        self.tree[nodes] = priorities
+        # recompute parents level by level; duplicate indices are harmless
+        nodes = np.unique(nodes // 2)
+        while nodes[0] >= 1:
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+            if nodes[0] == 1:
+                break
+            nodes = np.unique(nodes // 2)
+
+    def find(self, values):
+        # leaf index whose prefix-sum interval contains each value
+        nodes = np.ones(len(values), dtype=np.int64)
+        values = np.array(values, dtype=np.float64)
+        while nodes[0] < self.size:
+            left = 2 * nodes
+            left_sum = self.tree[left]
+            go_right = values > left_sum
+            values = np.where(go_right, values - left_sum, values)
+            nodes = np.where(go_right, left + 1, left)
+        return nodes - self.size
+
+
+class PrioritizedReplayMemory(ReplayMemory):
+    """
+    Replay memory that samples transitions in proportion to their TD error.
+
+    New transitions get the highest priority seen so far, so each one is
+    replayed at least once. sample_with_weights() returns importance-sampling
+    weights (annealed from beta towards 1) to correct the bias, and
+    update_priorities() feeds the TD errors from QTrainer.train_step back in.
+    """
+
+    def __init__(self, capacity, state_size=11, action_size=3, batch_size=1000, seed=None,
+                 alpha=0.6, beta=0.4, beta_increment=0.001, eps=0.01):
+        super().__init__(capacity, state_size, action_size, batch_size, seed)
+        self.tree = SumTree(capacity)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.eps = eps
+        self.max_priority = 1.0
+
+    def push(self, state, action, reward, next_state, done):
+        i = super().push(state, action, reward, next_state, done)
+        self.tree.set(i, self.max_priority ** self.alpha)
+        return i
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        idx = super().push_batch(states, actions, rewards, next_states, dones)
+        self.tree.update(idx, self.max_priority ** self.alpha)
+        return idx
+
+    def sample_indices(self, batch_size):
+        # stratified: one draw from each of batch_size equal slices of the total
+        total = self.tree.total
+        bounds = (np.arange(batch_size) + self.rng.random(batch_size)) * (total / batch_size)
+        return np.minimum(self.tree.find(bounds), self.size - 1)
+
+    def sample_with_weights(self, batch_size):
+        """
+        Returns:
+            tuple: (batch, idx, weights) where batch is what sample() returns,
+            idx are the sampled slots and weights is a float tensor of
+            importance-sampling weights normalised to a maximum of 1.
+        """
+
+        idx = self.sample_indices(batch_size)
+        probs = self.tree.get(idx) / self.tree.total
+        weights = (self.size * probs) ** -self.beta
+        weights /= weights.max()
+        self.beta = min(1.0, self.beta + self.beta_increment)
+        return self.gather(idx), idx, torch.from_numpy(weights.astype(np.float32))
+
+    def update_priorities(self, idx, td_errors):
+        priorities = np.abs(np.asarray(td_errors, dtype=np.float64)) + self.eps
+        self.max_priority = max(self.max_priority, priorities.max())
+        self.tree.update(idx, priorities ** self.alpha)
+
+    def state_dict(self):
+        state = super().state_dict()
+        state['priorities'] = self.tree.get(np.arange(self.size))
+        state['max_priority'] = self.max_priority
+        state['beta'] = self.beta
+        return state
+
+    def load_state_dict(self, state):
+        super().load_state_dict(state)
+        self.tree.tree[:] = 0
+        if 'priorities' in state:
+            self.max_priority = state['max_priority']
+            self.beta = state['beta']
+            priorities = state['priorities']
+        else:
+            # saved from a uniform memory: start every transition at max priority
+            priorities = self.max_priority ** self.alpha
+        if self.size:
+            self.tree.update(np.arange(self.size), priorities)
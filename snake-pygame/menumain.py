@@ -1,16 +1,21 @@
 
 
 import tkinter as tk
-import subprocess
+import os
+from launcher import Launcher
+
+# game scripts are looked up next to this menu
+script_dir = os.path.dirname(os.path.abspath(__file__))
+launcher = None
 
 def run_script(script_name):
     """
-    Executes a Python script using the subprocess module.
+    Starts a Python script from the warm launcher process.
 
     Args:
         script_name (str): The name of the Python script to be executed.
     """
-    subprocess.run(['python3', script_name])
+    launcher.launch(os.path.join(script_dir, script_name))
 
 def create_window():
     
@@ -20,6 +25,10 @@ def create_window():
     The menu includes buttons to launch different game modes or exit the application.
     """
 
+    global launcher
+    # fork the launcher before Tk starts so games open without a cold start
+    launcher = Launcher()
+
     window = tk.Tk()
     window.title("Snake Game Menu")
 
@@ -36,6 +45,7 @@ def create_window():
     button4.pack(pady=20)
 
     window.mainloop()
+    launcher.close()
 
 if __name__ == "__main__":
     create_window()
\ No newline at end of file
@@ -2,6 +2,7 @@ import torch
 import torch.nn as nn
 import torch.optim as optim
 import torch.nn.functional as F
+import numpy as np
 import os
 
 class Linear_QNet(nn.Module):
@@ -31,11 +32,12 @@ class QTrainer:
         self.optimizer = optim.Adam(model.parameters(), lr=self.lr)
         self.criterion = nn.MSELoss()
 
-    def train_step(self, state, action, reward, next_state, done):
-        state = torch.tensor(state, dtype=torch.float)
-        next_state = torch.tensor(next_state, dtype=torch.float)
-        action = torch.tensor(action, dtype=torch.long)
-        reward = torch.tensor(reward, dtype=torch.float)
+    def train_step(self, state, action, reward, next_state, done, weights=None):
+        state = _as_tensor(state, torch.float)
+        next_state = _as_tensor(next_state, torch.float)
+        action = _as_tensor(action, torch.long)
+        reward = _as_tensor(reward, torch.float)
+        done = _as_tensor(done, torch.bool)
         # (n, x)
 
         if len(state.shape) == 1:
@@ -44,27 +46,39 @@ class QTrainer:
             next_state = torch.unsqueeze(next_state, 0)
             action = torch.unsqueeze(action, 0)
             reward = torch.unsqueeze(reward, 0)
-            done = (done, )
+            done = torch.unsqueeze(done, 0)
 
         # 1: predicted Q values with current state
         pred = self.model(state)
 
-        target = pred.clone()
-        for idx in range(len(done)):
-            Q_new = reward[idx]
-            if not done[idx]:
-                Q_new = reward[idx] + self.gamma * torch.max(self.model(next_state[idx]))
+        # 2: Q_new = r + y * max(next_predicted Q value) -> only do this if not done
+        # one no-grad forward pass for the whole batch of next states
+        with torch.no_grad():
+            next_q = self.model(next_state).max(dim=1).values
+        Q_new = torch.where(done, reward, reward + self.gamma * next_q)
 
-            target[idx][torch.argmax(action).item()] = Q_new
+        # pred.clone(), then preds[argmax(action)] = Q_new for each sample's own action
+        chosen = torch.argmax(action, dim=1, keepdim=True)
+        target = pred.detach().clone()
+        target.scatter_(1, chosen, Q_new.unsqueeze(1))
 
-        # 2: Q_new = r + y * max(next_predicted Q value) -> only do this if not done
-        # pred.clone()
-        # preds[argmax(action)] = Q_new
         self.optimizer.zero_grad()
-        loss = self.criterion(target, pred)
+        if weights is None:
+            loss = self.criterion(target, pred)
+        else:
+            # importance-sampling weights from prioritized replay
+            weights = _as_tensor(weights, torch.float)
+            loss = (weights.unsqueeze(1) * (target - pred) ** 2).mean()
         loss.backward()
 
         self.optimizer.step()
 
+        # TD errors of the chosen actions, for prioritized replay
+        return (Q_new - pred.detach().gather(1, chosen).squeeze(1)).abs().numpy()
 
 
+def _as_tensor(x, dtype):
+    # batches arrive as tensors, arrays, or tuples/lists of arrays
+    if isinstance(x, torch.Tensor):
+        return x.to(dtype)
+    return torch.as_tensor(np.asarray(x), dtype=dtype)
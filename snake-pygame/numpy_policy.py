@@ -0,0 +1,63 @@
+import argparse
+
+import numpy as np
+
+# Linear_QNet parameter names, in the order they are stored
+PARAM_NAMES = ('linear1.weight', 'linear1.bias', 'linear2.weight', 'linear2.bias')
+
+
+class NumpyQNet:
+    """
+    Linear_QNet forward pass in plain NumPy, for scripts that only play.
+
+    Same layout and semantics as Linear_QNet: relu(x W1^T + b1) W2^T + b2
+    on a single state or a batch of states. No torch import needed.
+    """
+
+    def __init__(self, params):
+        self.w1, self.b1, self.w2, self.b2 = (np.asarray(params[k], dtype=np.float32) for k in PARAM_NAMES)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as params:
+            return cls(params)
+
+    def forward(self, x):
+        x = np.asarray(x, dtype=np.float32)
+        x = np.maximum(x @ self.w1.T + self.b1, 0)
+        return x @ self.w2.T + self.b2
+
+    __call__ = forward
+
+
+def export_npz(state_dict, path):
+    # state_dict of a Linear_QNet (tensors or arrays) -> uncompressed .npz
+    params = {k: np.asarray(state_dict[k].detach().cpu() if hasattr(state_dict[k], 'detach') else state_dict[k],
+                            dtype=np.float32)
+              for k in PARAM_NAMES}
+    np.savez(path, **params)
+
+
+def export_checkpoint(checkpoint_path, path=None):
+    """
+    Writes the weights of a torch checkpoint next to it as <checkpoint>.npz.
+
+    Returns:
+        str: The path written.
+    """
+
+    import torch
+
+    if path is None:
+        path = checkpoint_path + '.npz'
+    state_dict = torch.load(checkpoint_path, map_location=torch.device('cpu'))
+    export_npz(state_dict, path)
+    return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export Linear_QNet checkpoints for torch-free play')
+    parser.add_argument('checkpoints', nargs='+', help='checkpoint files, e.g. model/model202-74')
+    args = parser.parse_args()
+    for checkpoint in args.checkpoints:
+        print('Wrote', export_checkpoint(checkpoint))
@@ -0,0 +1,75 @@
+from collections import deque
+from functools import lru_cache
+
+# direction name and cell step, with y pointing up like turtle
+MOVES = (("RIGHT", 1, 0), ("UP", 0, 1), ("LEFT", -1, 0), ("DOWN", 0, -1))
+OPPOSITE = {"RIGHT": "LEFT", "LEFT": "RIGHT", "UP": "DOWN", "DOWN": "UP"}
+
+
+def find_path(start, goal, obstacles, body=(), bounds=(-19, 19, -14, 14), heading=None):
+    """
+    Shortest safe path for the snake's head from start to goal.
+
+    Breadth-first search over the board cells. Obstacles are never entered.
+    Body cells (from the neck to the tail) may be entered once the tail has
+    moved off them: the cell i segments behind the neck frees up after
+    len(body) - i moves. The snake cannot reverse, so the first move is
+    never the opposite of its heading. The result is cached per board, so
+    asking again before anything moves costs a dictionary lookup.
+
+    Args:
+        start (tuple): Head cell (x, y).
+        goal (tuple): Target cell (x, y).
+        obstacles (iterable): Cells that are always blocked.
+        body (iterable): Body cells, neck first.
+        bounds (tuple): (x_min, x_max, y_min, y_max) cells inside the board.
+        heading (str): Direction the snake is moving in ("up", "RIGHT", ...),
+            or None/"stop" when it may start in any direction.
+
+    Returns:
+        list: Directions ("UP", "DOWN", "LEFT", "RIGHT") from start to goal,
+        or None when the goal cannot be reached.
+    """
+
+    reverse = OPPOSITE.get(str(heading).upper())
+    path = _find_path(tuple(start), tuple(goal), frozenset(map(tuple, obstacles)),
+                      tuple(map(tuple, body)), tuple(bounds), reverse)
+    return None if path is None else list(path)
+
+
+@lru_cache(maxsize=128)
+def _find_path(start, goal, obstacles, body, bounds, reverse):
+    x_min, x_max, y_min, y_max = bounds
+    # first move on which each body cell is free again
+    free_at = {}
+    for i, cell in enumerate(body):
+        free_at[cell] = max(free_at.get(cell, 0), len(body) - i)
+
+    parent = {start: None}
+    frontier = deque([(start, 0)])
+    while frontier:
+        cell, steps = frontier.popleft()
+        if cell == goal:
+            break
+        x, y = cell
+        for name, dx, dy in MOVES:
+            if steps == 0 and name == reverse:
+                continue
+            nxt = (x + dx, y + dy)
+            if nxt in parent or nxt in obstacles:
+                continue
+            if not (x_min <= nxt[0] <= x_max and y_min <= nxt[1] <= y_max):
+                continue
+            if free_at.get(nxt, 0) > steps + 1:
+                continue
+            parent[nxt] = (cell, name)
+            frontier.append((nxt, steps + 1))
+    if goal not in parent:
+        return None
+
+    directions = []
+    cell = goal
+    while parent[cell] is not None:
+        cell, name = parent[cell]
+        directions.append(name)
+    return tuple(reversed(directions))
@@ -0,0 +1,126 @@
+import atexit
+import json
+import os
+import time
+from collections import deque
+from contextlib import nullcontext
+
+MAX_TRACE_EVENTS = 1_000_000 # the trace keeps the most recent events, older ones are dropped
+
+
+class _Phase:
+    __slots__ = ('timer', 'name', 'start')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.timer.add(self.name, self.start, time.perf_counter())
+
+
+class PhaseTimer:
+    """
+    Wall time and call counts per named phase of the training loop.
+
+        with timer.phase('play_step'):
+            game.play_step(move)
+
+    Totals are kept for the current report window; report() prints them
+    with steps/sec every `every` games. With trace_path set, every phase is
+    also recorded as a Chrome trace event and written on close() (also run
+    at interpreter exit), for chrome://tracing or ui.perfetto.dev. Only the
+    last MAX_TRACE_EVENTS events are kept, so a long run's trace shows where
+    it ended up rather than how it started.
+    """
+
+    def __init__(self, every=100, trace_path=None):
+        self.every = every
+        self.trace_path = trace_path
+        self._phases = {}
+        self._totals = {}
+        self._calls = {}
+        self._steps = 0
+        self._events = deque(maxlen=MAX_TRACE_EVENTS) if trace_path else None
+        self._origin = time.perf_counter()
+        self._window_start = self._origin
+        if trace_path:
+            atexit.register(self.close)
+
+    def phase(self, name):
+        # one reusable context manager per phase name
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = _Phase(self, name)
+            self._totals[name] = 0.0
+            self._calls[name] = 0
+        return phase
+
+    def add(self, name, start, end):
+        self._totals[name] += end - start
+        self._calls[name] += 1
+        if self._events is not None:
+            self._events.append((name, start, end))
+
+    def step(self, n=1):
+        self._steps += n
+
+    def summary(self):
+        elapsed = time.perf_counter() - self._window_start
+        lines = [f"{self._steps / elapsed:,.0f} steps/s over {elapsed:.1f}s"]
+        for name, total in sorted(self._totals.items(), key=lambda item: -item[1]):
+            calls = self._calls[name]
+            if calls:
+                lines.append(f"  {name:<20} {total:8.2f}s {100 * total / elapsed:5.1f}%"
+                             f" {calls:>9} calls {1e6 * total / calls:9.1f}us/call")
+        return '\n'.join(lines)
+
+    def reset(self):
+        for name in self._totals:
+            self._totals[name] = 0.0
+            self._calls[name] = 0
+        self._steps = 0
+        self._window_start = time.perf_counter()
+
+    def report(self, n_games):
+        if n_games % self.every == 0:
+            print(self.summary())
+            self.reset()
+
+    def close(self):
+        if self._events is None:
+            return
+        directory = os.path.dirname(self.trace_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        pid = os.getpid()
+        events = [{'name': name, 'ph': 'X', 'pid': pid, 'tid': 0,
+                   'ts': 1e6 * (start - self._origin), 'dur': 1e6 * (end - start)}
+                  for name, start, end in self._events]
+        with open(self.trace_path, 'w') as f:
+            json.dump({'traceEvents': events}, f)
+        self._events = None
+        atexit.unregister(self.close)
+
+
+class NullTimer:
+    """
+    PhaseTimer stand-in for runs without profiling; every call is a no-op.
+    """
+
+    _phase = nullcontext()
+
+    def phase(self, name):
+        return self._phase
+
+    def step(self, n=1):
+        pass
+
+    def report(self, n_games):
+        pass
+
+    def close(self):
+        pass
@@ -0,0 +1,108 @@
+import os
+
+import numpy as np
+
+from numpy_policy import NumpyQNet, export_npz
+
+# checkpoints are looked up here unless the name is an existing path
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model')
+
+ALIASES = {
+    'blue': 'model202-74',
+    'orange': 'model_g3_196-71',
+}
+
+_models = {} # real path -> loaded NumpyQNet, shared by every caller
+_paths = {} # name as asked for -> real path
+
+
+def resolve(name):
+    """
+    Turns an alias, a file name in MODEL_DIR or a path into the real path
+    of the checkpoint, so every spelling of the same file maps to one key.
+
+    Raises:
+        FileNotFoundError: If no such checkpoint exists.
+    """
+
+    if name in _paths:
+        return _paths[name]
+    target = ALIASES.get(name, name)
+    for path in (target, os.path.join(MODEL_DIR, target), os.path.join(MODEL_DIR, os.path.basename(target))):
+        if os.path.isfile(path):
+            _paths[name] = os.path.realpath(path)
+            return _paths[name]
+    raise FileNotFoundError(f"Trained model not found at {target}")
+
+
+def get_model(name):
+    """
+    Returns the model for a checkpoint, loading it on first use only.
+
+    Snakes that ask for the same checkpoint get the same model object.
+    The weights come from the exported <checkpoint>.npz when it is at
+    least as new as the checkpoint, so torch is only imported for
+    checkpoints that have not been exported (see numpy_policy.py) or were
+    retrained since; those are exported again on the way.
+    """
+
+    path = resolve(name)
+    model = _models.get(path)
+    if model is None:
+        exported = path + '.npz'
+        if os.path.isfile(exported) and os.path.getmtime(exported) >= os.path.getmtime(path):
+            model = NumpyQNet.load(exported)
+        else:
+            state = _load_state(path)
+            model = NumpyQNet(state)
+            _export(state, exported)
+        _models[path] = model
+    return model
+
+
+def _export(state, exported):
+    # best effort: a read-only model folder just means loading through torch again
+    tmp = exported + '.tmp.npz'
+    try:
+        export_npz(state, tmp)
+        os.replace(tmp, exported)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _load_state(path):
+    import torch
+
+    cpu = torch.device('cpu')
+    try:
+        # map the file instead of reading it; needs the zip checkpoint format
+        return torch.load(path, map_location=cpu, mmap=True, weights_only=True)
+    except (RuntimeError, TypeError):
+        return torch.load(path, map_location=cpu)
+
+
+def predict_moves(names, states):
+    """
+    Picks the action for several snakes at once.
+
+    states[i] is the 11-feature state of a snake driven by checkpoint
+    names[i]. Snakes that share a checkpoint go through its model as one
+    batch, so there is one forward pass per checkpoint per tick however
+    many snakes are on the board.
+
+    Returns:
+        list: The action index (0 straight, 1 right, 2 left) for each snake.
+    """
+
+    groups = {}
+    for i, name in enumerate(names):
+        groups.setdefault(resolve(name), []).append(i)
+
+    states = np.asarray(states, dtype=np.float32)
+    moves = [0] * len(names)
+    for path, idx in groups.items():
+        pred = get_model(path)(states[idx])
+        for i, m in zip(idx, pred.argmax(axis=1).tolist()):
+            moves[i] = m
+    return moves
@@ -1,32 +1,18 @@
 import pygame
 import turtle
 import time
-import random
-import torch
-from model import Linear_QNet
-
-# Load trained DQN models (CPU only)
-import os
-
-# Blue AI Snake model
-comp_model = Linear_QNet(11, 256, 3)
-comp_model_path = 'model/model202-74'
-if os.path.exists(comp_model_path):
-    comp_model.load_state_dict(torch.load(comp_model_path, map_location=torch.device('cpu')))
-    comp_model.eval()
-else:
-    print(f"Error: Trained model not found at {comp_model_path}. Please train the model first and place the file in the 'model' directory.")
-    turtle.bye()
-    exit()
-
-# Orange AI Snake model
-orange_model = Linear_QNet(11, 256, 3)
-orange_model_path = 'model/model_g3_196-71'  
-if os.path.exists(orange_model_path):
-    orange_model.load_state_dict(torch.load(orange_model_path, map_location=torch.device('cpu')))
-    orange_model.eval()
-else:
-    print(f"Error: Trained orange model not found at {orange_model_path}. Please train the orange AI model first and place the file in the 'model' directory.")
+import registry
+import features
+from food import to_cell
+from turtle_board import TurtleBoard
+from turtle_render import CanvasRenderer
+
+# Trained DQN models (CPU only), loaded from the shared registry on first use
+try:
+    comp_model_path = registry.resolve('blue') # Blue AI Snake model
+    orange_model_path = registry.resolve('orange') # Orange AI Snake model
+except FileNotFoundError as e:
+    print(f"Error: {e}. Please train the model first and place the file in the 'model' directory.")
     turtle.bye()
     exit()
 
@@ -36,6 +22,14 @@ pygame.mixer.init()
 apple_sound = pygame.mixer.Sound('apple.wav')
 
 
+# Playing field: cells |x| <= FIELD_X and |y| <= FIELD_Y (31x23 cells of
+# 20 px). A snake that leaves it is reset; food spawns on the 29x21 inside.
+FIELD_X, FIELD_Y = 15, 11
+
+def off_field(t):
+    # True once a turtle has left the playing field
+    return abs(t.xcor()) > FIELD_X * 20 or abs(t.ycor()) > FIELD_Y * 20
+
 delay = 0.00  # 2x speedup
 score = 0
 high_score = 0
@@ -80,6 +74,12 @@ def start_snake_game():
     global score, high_score, delay, comp_score, orange_score
     wn.clear()
 
+    # Body segments are drawn on the canvas directly
+    renderer = CanvasRenderer(wn)
+
+    # Segments and food on the cells inside the playing field the food can spawn on
+    board = TurtleBoard(1 - FIELD_X, FIELD_X - 1, 1 - FIELD_Y, FIELD_Y - 1)
+
     # Player Snake
     head = turtle.Turtle()
     head.speed(0)
@@ -96,11 +96,12 @@ def start_snake_game():
     food.color("red")
     food.penup()
     food.goto(0, 100)
+    board.set_food(food.pos())
 
     # Tail segments
-    segments = []
-    comp_segments = []
-    orange_segments = []
+    segments = renderer.body("green", board)
+    comp_segments = renderer.body("blue", board)
+    orange_segments = renderer.body("orange", board)
 
     # AI Snakes
     comp_head = turtle.Turtle()
@@ -119,6 +120,18 @@ def start_snake_game():
     orange_head.goto(-200, -150)
     orange_head.direction = "up"
 
+    # Every AI snake with the checkpoint that drives it
+    ai_snakes = [
+        (comp_head, comp_segments, comp_model_path),
+        (orange_head, orange_segments, orange_model_path),
+    ]
+
+    def place_food():
+        # random free cell, off every snake on the board
+        pos = board.place_food(avoid=[head.pos(), comp_head.pos(), orange_head.pos()])
+        if pos is not None:
+            food.goto(pos)
+
     # Score Pen
     pen = turtle.Turtle()
     pen.speed(0)
@@ -156,46 +169,22 @@ def start_snake_game():
         elif head.direction == "left": head.setx(head.xcor() - 20)
         elif head.direction == "right": head.setx(head.xcor() + 20)
 
-    # AI movement with variable model
-    def move_ai_snake(snake_head, segments, q_model):
-        global comp_score, orange_score
-        def collision(x, y):
-            if x > 300 or x < -300 or y > 220 or y < -220:
-                if snake_head.color()[0] == "blue":
-                    snake_head.goto(200, 150); snake_head.direction = "right"
-                    for seg in segments: seg.goto(1000,1000)
-                    segments.clear()
-                else:
-                    snake_head.goto(-200, -150); snake_head.direction = "up"
-                    for seg in segments: seg.goto(1000,1000)
-                    segments.clear()
-                return True
-            return False
+    # AI state for one snake; the moves of all AI snakes are predicted together
+    def ai_state(snake_head, segments):
+        body = {to_cell(pos) for pos in segments}
+
+        def blocked(x, y):
+            # off the playing field or on the snake's own body, as in training
+            return abs(x) > FIELD_X or abs(y) > FIELD_Y or (x, y) in body
+
+        return features.turtle_state(snake_head.pos(), snake_head.direction, food.pos(), blocked)
 
+    # AI movement for the predicted action m
+    def move_ai_snake(snake_head, segments, m):
+        global comp_score, orange_score
         dirs = ["right","down","left","up"]
         idx = dirs.index(snake_head.direction)
         x,y = snake_head.xcor(), snake_head.ycor()
-        points = {"l": (x-20,y), "r": (x+20,y), "u": (x,y+20), "d": (x,y-20)}
-        dirs_bool = {d: snake_head.direction==d for d in ["left","right","up","down"]}
-        state = [
-            (dirs_bool["right"] and collision(*points["r"])) or
-            (dirs_bool["left"] and collision(*points["l"])) or
-            (dirs_bool["up"] and collision(*points["u"])) or
-            (dirs_bool["down"] and collision(*points["d"])),
-            (dirs_bool["up"] and collision(*points["r"])) or
-            (dirs_bool["down"] and collision(*points["l"])) or
-            (dirs_bool["left"] and collision(*points["u"])) or
-            (dirs_bool["right"] and collision(*points["d"])),
-            (dirs_bool["up"] and collision(*points["l"])) or
-            (dirs_bool["down"] and collision(*points["r"])) or
-            (dirs_bool["left"] and collision(*points["d"])) or
-            (dirs_bool["right"] and collision(*points["u"])),
-            dirs_bool["left"], dirs_bool["right"], dirs_bool["up"], dirs_bool["down"],
-            food.xcor()<x, food.xcor()>x, food.ycor()>y, food.ycor()<y
-        ]
-        tensor = torch.tensor(state, dtype=torch.float)
-        pred = q_model(tensor)
-        m = torch.argmax(pred).item()
         new_dir = dirs[idx] if m==0 else dirs[(idx+1)%4] if m==1 else dirs[(idx-1)%4]
         snake_head.direction = new_dir
         if new_dir=="right": snake_head.setx(x+20)
@@ -203,43 +192,45 @@ def start_snake_game():
         elif new_dir=="up": snake_head.sety(y+20)
         else: snake_head.sety(y-20)
 
+        # off the board: start again from the snake's corner
+        if off_field(snake_head):
+            if snake_head.color()[0] == "blue":
+                snake_head.goto(200, 150); snake_head.direction = "right"
+            else:
+                snake_head.goto(-200, -150); snake_head.direction = "up"
+            segments.clear()
+            return
+
         if snake_head.distance(food)<20:
-            food.goto(random.randint(-280,280), random.randint(-200,200))
-            new_seg = turtle.Turtle(); new_seg.speed(0)
-            new_seg.shape("square"); new_seg.color(snake_head.color()[0]); new_seg.penup()
-            segments.append(new_seg)
+            place_food()
+            segments.grow()
             if snake_head.color()[0] == "blue": comp_score +=1
             else: orange_score +=1
 
     def game_loop():
         global score, high_score, delay
         wn.update()
-        for i in range(len(segments)-1,0,-1): segments[i].goto(segments[i-1].pos())
-        if segments: segments[0].goto(head.pos())
-        for i in range(len(comp_segments)-1,0,-1): comp_segments[i].goto(comp_segments[i-1].pos())
-        if comp_segments: comp_segments[0].goto(comp_head.pos())
-        for i in range(len(orange_segments)-1,0,-1): orange_segments[i].goto(orange_segments[i-1].pos())
-        if orange_segments: orange_segments[0].goto(orange_head.pos())
+        segments.follow(head.pos())
+        comp_segments.follow(comp_head.pos())
+        orange_segments.follow(orange_head.pos())
 
         move_player()
-        move_ai_snake(comp_head, comp_segments, comp_model)
-        move_ai_snake(orange_head, orange_segments, orange_model)
+        states = [ai_state(h, segs) for h, segs, _ in ai_snakes]
+        moves = registry.predict_moves([path for _, _, path in ai_snakes], states)
+        for (h, segs, _), m in zip(ai_snakes, moves):
+            move_ai_snake(h, segs, m)
 
         # Player boundary check
-        if head.xcor() > 300 or head.xcor() < -300 or head.ycor() > 220 or head.ycor() < -220:
+        if off_field(head):
             head.goto(0, 0)
             head.direction = "stop"
-            for seg in segments:
-                seg.goto(1000, 1000)
             segments.clear()
             score = 0
 
         if head.distance(food)<20:
             apple_sound.play() 
-            food.goto(random.randint(-280,280), random.randint(-200,200))
-            new_seg = turtle.Turtle(); new_seg.speed(0)
-            new_seg.shape("square"); new_seg.color("green"); new_seg.penup()
-            segments.append(new_seg)
+            place_food()
+            segments.grow()
             score+=1
             if score>high_score: high_score=score
 
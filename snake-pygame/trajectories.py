@@ -0,0 +1,236 @@
+import argparse
+import atexit
+import json
+import os
+
+import numpy as np
+import torch
+
+GROW_ROWS = 1 << 16 # files grow by this many transitions at a time
+FLUSH_EVERY = 10_000 # transitions between flushes of the data and the row count
+META_NAME = 'meta.json'
+
+
+def _fields(state_size, action_size):
+    # same dtypes as ReplayMemory: 0/1 features, one-hot actions, rewards -10/0/+10
+    return (
+        ('states', np.uint8, (state_size,)),
+        ('actions', np.uint8, (action_size,)),
+        ('rewards', np.int8, ()),
+        ('next_states', np.uint8, (state_size,)),
+        ('dones', np.bool_, ()),
+    )
+
+
+def _read_meta(folder):
+    path = os.path.join(folder, META_NAME)
+    if not os.path.isfile(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _row_bytes(dtype, shape):
+    return np.dtype(dtype).itemsize * int(np.prod(shape, dtype=np.int64))
+
+
+class TrajectoryWriter:
+    """
+    Appends transitions to a folder of raw, fixed-dtype files on disk.
+
+    There is one file per field (states.bin, actions.bin, ...) holding its
+    rows back to back, written through np.memmap, plus meta.json with the
+    number of rows. The files are grown GROW_ROWS rows at a time and cut
+    back to the rows written on close(), which also runs at interpreter
+    exit. The row count is only saved on flush(), so readers never see a
+    half-written transition. Opening an existing store appends to it.
+    """
+
+    def __init__(self, folder, state_size=11, action_size=3, grow_rows=GROW_ROWS, flush_every=FLUSH_EVERY):
+        os.makedirs(folder, exist_ok=True)
+        self.folder = folder
+        self.state_size = state_size
+        self.action_size = action_size
+        self.grow_rows = grow_rows
+        self.flush_every = flush_every
+        self.fields = _fields(state_size, action_size)
+
+        meta = _read_meta(folder)
+        if meta is not None and (meta['state_size'], meta['action_size']) != (state_size, action_size):
+            raise ValueError(f"{folder} stores states of {meta['state_size']} and actions of "
+                             f"{meta['action_size']}, not {state_size} and {action_size}")
+        self.size = meta['size'] if meta is not None else 0
+        self._unflushed = 0
+        self._maps = None
+        self._map(self.size + grow_rows)
+        atexit.register(self.close)
+
+    def _path(self, name):
+        return os.path.join(self.folder, name + '.bin')
+
+    def _map(self, capacity):
+        # resize every file to capacity rows and map it again
+        if self._maps is not None:
+            for array in self._maps:
+                array.flush()
+        self._maps = None
+        maps = []
+        for name, dtype, shape in self.fields:
+            path = self._path(name)
+            with open(path, 'ab') as f:
+                f.truncate(capacity * _row_bytes(dtype, shape))
+            maps.append(np.memmap(path, dtype=dtype, mode='r+', shape=(capacity,) + shape))
+        self._maps = tuple(maps)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.size
+
+    def push(self, state, action, reward, next_state, done):
+        if self.size == self.capacity:
+            self._map(self.capacity + self.grow_rows)
+        i = self.size
+        for array, value in zip(self._maps, (state, action, reward, next_state, done)):
+            array[i] = value
+        self.size += 1
+        self._written(1)
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        n = len(states)
+        if self.size + n > self.capacity:
+            self._map(self.size + n + self.grow_rows)
+        for array, values in zip(self._maps, (states, actions, rewards, next_states, dones)):
+            array[self.size:self.size + n] = values
+        self.size += n
+        self._written(n)
+
+    def _written(self, n):
+        self._unflushed += n
+        if self._unflushed >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        for array in self._maps:
+            array.flush()
+        meta = {'size': self.size, 'state_size': self.state_size, 'action_size': self.action_size}
+        tmp = os.path.join(self.folder, META_NAME + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(self.folder, META_NAME))
+        self._unflushed = 0
+
+    def close(self):
+        if self._maps is None:
+            return
+        self.flush()
+        self._maps = None
+        for name, dtype, shape in self.fields:
+            os.truncate(self._path(name), self.size * _row_bytes(dtype, shape))
+        atexit.unregister(self.close)
+
+
+class TrajectoryDataset:
+    """
+    Read-only view of a store written by TrajectoryWriter.
+
+    The files are memory-mapped, so only the rows a batch touches are read
+    from disk and a store of millions of transitions costs no RAM up front.
+    Rows written after the last flush are not visible.
+    """
+
+    def __init__(self, folder):
+        meta = _read_meta(folder)
+        if meta is None:
+            raise FileNotFoundError(f"No trajectory store at {folder}")
+        self.folder = folder
+        self.size = meta['size']
+        self.arrays = []
+        for name, dtype, shape in _fields(meta['state_size'], meta['action_size']):
+            if self.size:
+                array = np.memmap(os.path.join(folder, name + '.bin'), dtype=dtype, mode='r',
+                                  shape=(self.size,) + shape)
+            else:
+                array = np.zeros((0,) + shape, dtype=dtype) # np.memmap cannot map 0 bytes
+            self.arrays.append(array)
+
+    def __len__(self):
+        return self.size
+
+    def gather(self, idx):
+        # rows idx of every field as tensors; sorted idx keep the reads in file order
+        return tuple(torch.from_numpy(np.take(array, idx, axis=0)) for array in self.arrays)
+
+    def batches(self, batch_size=1000, shuffle=True, rng=None):
+        """
+        Yields (states, actions, rewards, next_states, dones) tensor batches
+        covering every stored transition once.
+        """
+
+        if shuffle:
+            rng = rng if rng is not None else np.random.default_rng()
+            order = rng.permutation(self.size)
+        else:
+            order = np.arange(self.size)
+        for start in range(0, self.size, batch_size):
+            yield self.gather(np.sort(order[start:start + batch_size]))
+
+    def fill(self, memory, chunk=GROW_ROWS):
+        """
+        Pushes the most recent transitions into a replay memory, as many as
+        it holds, a chunk at a time.
+        """
+
+        start = max(0, self.size - memory.capacity)
+        for i in range(start, self.size, chunk):
+            memory.push_batch(*(np.asarray(array[i:i + chunk]) for array in self.arrays))
+
+
+def pretrain(trainer, dataset, epochs=1, batch_size=1000, seed=None):
+    """
+    Trains a QTrainer's model on stored transitions.
+
+    Each epoch goes over the whole dataset once in shuffled batches and
+    prints the mean TD error of its batches.
+
+    Args:
+        trainer (QTrainer): The trainer of the model to pretrain or fine-tune.
+        dataset (TrajectoryDataset): The stored transitions.
+        epochs (int): Passes over the dataset.
+        batch_size (int): Transitions per train_step.
+        seed (int): Seed of the shuffling.
+    """
+
+    rng = np.random.default_rng(seed)
+    for epoch in range(epochs):
+        total, batches = 0.0, 0
+        for batch in dataset.batches(batch_size, rng=rng):
+            total += float(trainer.train_step(*batch).mean())
+            batches += 1
+        print(f"Pretrain epoch {epoch + 1}/{epochs}: {batches} batches, "
+              f"mean TD error {total / max(batches, 1):.3f}")
+
+
+if __name__ == '__main__':
+    from model import Linear_QNet, QTrainer
+
+    parser = argparse.ArgumentParser(description='Pretrain a Linear_QNet on stored transitions')
+    parser.add_argument('folder', help='trajectory store written by agent.py --store')
+    parser.add_argument('--epochs', type=int, default=1, help='passes over the stored transitions')
+    parser.add_argument('--batch', type=int, default=1000, help='transitions per training step')
+    parser.add_argument('--lr', type=float, default=0.001, help='learning rate')
+    parser.add_argument('--init', default=None, help='fine-tune these weights instead of starting fresh')
+    parser.add_argument('--out', default='model_pretrained.pth', help='file name in ./model for the weights')
+    parser.add_argument('--seed', type=int, default=None, help='seed of the weights and the shuffling')
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        torch.manual_seed(args.seed)
+    dataset = TrajectoryDataset(args.folder)
+    print(f"{len(dataset)} transitions in {args.folder}")
+    model = Linear_QNet(11, 256, 3)
+    if args.init:
+        model.load_state_dict(torch.load(args.init))
+    trainer = QTrainer(model, lr=args.lr, gamma=0.9)
+    pretrain(trainer, dataset, args.epochs, args.batch, args.seed)
+    model.save(args.out)
+    print('Saved', os.path.join('./model', args.out))
@@ -0,0 +1,131 @@
+from food import FoodSampler, to_cell
+from grid import OccupancyGrid
+
+
+class TurtleBoard(OccupancyGrid):
+    """
+    Occupancy index of a turtle board: obstacles, snake segments and food.
+
+    Turtle boards are centred on (0, 0) with y pointing up, so cells run
+    from (x_min, y_min) to (x_max, y_max) and callers pass turtle positions
+    in pixels. Obstacles are a fixed bitmap, segments are counted like in
+    OccupancyGrid (a cell covered twice means the snake ran into itself)
+    and the food is a single cell. A FoodSampler is kept in step with all
+    three, so collision queries and spawning food or obstacles on a free
+    cell are O(1) however many obstacles and segments there are.
+    """
+
+    def __init__(self, x_min=-19, x_max=19, y_min=-14, y_max=14, unit=20, rng=None):
+        super().__init__(x_max - x_min + 1, y_max - y_min + 1)
+        self.x0 = x_min
+        self.y0 = y_min
+        self.unit = unit
+        self.rng = rng
+        self.clear()
+
+    def clear(self):
+        super().clear()
+        self.obstacles = bytearray(self.size)
+        self.food = None # food cell (x, y)
+        self.free = FoodSampler(self.cols, self.rows, self.x0, self.y0, self.rng)
+
+    def cell(self, x, y):
+        return super().cell(x - self.x0, y - self.y0)
+
+    def index(self, pos):
+        # linear index of the cell under a turtle position, -1 off the board
+        return self.cell(*to_cell(pos, self.unit))
+
+    def to_pos(self, cell):
+        return (cell[0] * self.unit, cell[1] * self.unit)
+
+    def blocked(self, pos):
+        """
+        True if pos is off the board or on an obstacle.
+        """
+
+        i = self.index(pos)
+        return i == -1 or self.obstacles[i] == 1
+
+    def segments_at(self, pos):
+        i = self.index(pos)
+        return 0 if i == -1 else self.counts[i]
+
+    def is_food(self, pos):
+        return to_cell(pos, self.unit) == self.food
+
+    def add_segment(self, pos):
+        i = self.index(pos)
+        if i != -1:
+            self.add(i)
+            self.free.occupy(*to_cell(pos, self.unit))
+
+    def remove_segment(self, pos):
+        i = self.index(pos)
+        if i != -1:
+            self.remove(i)
+            self.free.release(*to_cell(pos, self.unit))
+
+    def add_obstacle(self, pos):
+        """
+        Puts an obstacle on pos if the cell is free.
+
+        Returns:
+            bool: False if pos is off the board or already holds an obstacle,
+            a segment or the food.
+        """
+
+        x, y = to_cell(pos, self.unit)
+        if not self.free.is_free(x, y):
+            return False
+        self.obstacles[self.cell(x, y)] = 1
+        self.free.occupy(x, y)
+        return True
+
+    def clear_obstacles(self):
+        # frees every obstacle cell, so another level can be loaded
+        for i, blocked in enumerate(self.obstacles):
+            if blocked:
+                self.free.release(i % self.cols + self.x0, i // self.cols + self.y0)
+        self.obstacles = bytearray(self.size)
+
+    def spawn_obstacle(self, avoid=()):
+        """
+        Puts an obstacle on a random free cell that is not under any of the
+        positions in avoid (the snake's spawn point, say).
+
+        Returns:
+            tuple: The obstacle's turtle position, or None if the board is full.
+        """
+
+        cell = self.free.sample_avoiding(to_cell(pos, self.unit) for pos in avoid)
+        if cell is None:
+            return None
+        self.obstacles[self.cell(*cell)] = 1
+        self.free.occupy(*cell)
+        return self.to_pos(cell)
+
+    def set_food(self, pos):
+        if self.food is not None:
+            self.free.release(*self.food)
+        self.food = to_cell(pos, self.unit)
+        self.free.occupy(*self.food)
+
+    def place_food(self, avoid=()):
+        """
+        Moves the food to a random free cell that is not under any of the
+        positions in avoid (the snake's head, which is not a segment).
+
+        Returns:
+            tuple: The food's turtle position, or None if the board is full.
+        """
+
+        if self.food is not None:
+            self.free.release(*self.food)
+            self.food = None
+        cell = self.free.sample_avoiding(to_cell(pos, self.unit) for pos in avoid)
+        if cell is None:
+            return None
+        self.food = cell
+        self.free.occupy(*cell)
+        return self.to_pos(cell)
@@ -0,0 +1,111 @@
+from collections import deque
+
+
+class CanvasRenderer:
+    """
+    Draws grid cells straight onto a turtle screen's Tk canvas.
+
+    turtle redraws every turtle on each wn.update(), so a snake built from
+    one turtle per segment costs more per frame the longer it gets. Cells
+    drawn here are plain canvas rectangles instead: the static layer is
+    drawn once, and a moving body changes a single rectangle per step.
+    Create the renderer after wn.clear(), which deletes everything on the
+    canvas.
+    """
+
+    def __init__(self, screen, unit=20):
+        self.canvas = screen.getcanvas()
+        self.unit = unit
+
+    def box(self, pos):
+        # the canvas has y pointing down, turtle has it pointing up
+        x, y = pos
+        half = self.unit / 2
+        return (x - half, -y - half, x + half, -y + half)
+
+    def rect(self, pos, color):
+        item = self.canvas.create_rectangle(*self.box(pos), fill=color, outline=color)
+        # keep the cells under the turtles (head, food, score text)
+        self.canvas.tag_lower(item)
+        return item
+
+    def static_layer(self, cells, color):
+        # drawn once and never touched again
+        return [self.rect(pos, color) for pos in cells]
+
+    def body(self, color, board=None):
+        return CanvasBody(self, color, board)
+
+
+class CanvasBody:
+    """
+    The segments behind a snake's head, drawn as canvas rectangles.
+
+    Iterating gives the segment positions from the neck to the tail, the
+    same positions the segment turtles had. follow() moves the body one
+    step behind the head by moving the tail rectangle to the front, so a
+    step costs one canvas update however long the snake is. With a
+    TurtleBoard given, every segment that is placed or removed is also
+    added to or removed from the board's index.
+    """
+
+    def __init__(self, renderer, color, board=None):
+        self.renderer = renderer
+        self.color = color
+        self.board = board
+        self.cells = deque()
+        self.items = deque()
+        self.pending = 0 # segments still to be added by follow()
+        self._spare = [] # hidden rectangles kept for reuse after clear()
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def grow(self):
+        # the tail stays put on the next step, like a newly appended segment
+        self.pending += 1
+
+    def follow(self, pos):
+        """
+        Moves the body one step: the first segment goes to pos (where the
+        head is before it moves) and the others take the place of the
+        segment in front of them.
+        """
+
+        pos = tuple(pos)
+        canvas = self.renderer.canvas
+        if self.pending:
+            self.pending -= 1
+            if self._spare:
+                item = self._spare.pop()
+                canvas.coords(item, *self.renderer.box(pos))
+                canvas.itemconfigure(item, state='normal')
+            else:
+                item = self.renderer.rect(pos, self.color)
+        elif self.cells:
+            tail = self.cells.pop()
+            if self.board is not None:
+                self.board.remove_segment(tail)
+            item = self.items.pop()
+            canvas.coords(item, *self.renderer.box(pos))
+        else:
+            return
+        self.cells.appendleft(pos)
+        self.items.appendleft(item)
+        if self.board is not None:
+            self.board.add_segment(pos)
+
+    def clear(self):
+        canvas = self.renderer.canvas
+        for item in self.items:
+            canvas.itemconfigure(item, state='hidden')
+        self._spare.extend(self.items)
+        if self.board is not None:
+            for pos in self.cells:
+                self.board.remove_segment(pos)
+        self.items.clear()
+        self.cells.clear()
+        self.pending = 0
@@ -0,0 +1,154 @@
+import numpy as np
+
+import features
+from features import RIGHT
+
+DX = np.array([1, 0, -1, 0])
+DY = np.array([0, 1, 0, -1])
+
+# [straight, right, left] -> change of clock-wise index
+TURN = np.array([0, 1, -1])
+
+
+class VecSnakeEnv:
+    """
+    Steps N independent snake games at once.
+
+    Every board lives in NumPy arrays measured in grid cells (a 640x480
+    SnakeGameAI window is 32x24 cells). The rules match SnakeGameAI:
+    rewards are +10 for food and -10 for dying, and a game also ends once
+    it runs for more than 100 * len(snake) frames. Finished games are reset
+    automatically, so the states returned by step() are always the states
+    the next actions should be chosen from.
+    """
+
+    def __init__(self, n, cols=32, rows=24, seed=None):
+        self.n = n
+        self.cols = cols
+        self.rows = rows
+        self.max_len = cols * rows + 1
+        self.rng = np.random.default_rng(seed)
+        self._envs = np.arange(n)
+
+        # occupancy[i, y, x] counts the segments of game i in that cell
+        self.occupancy = np.zeros((n, rows, cols), dtype=np.uint8)
+        # ring buffer of body cells, head at self.head_ptr
+        self.body_x = np.zeros((n, self.max_len), dtype=np.int16)
+        self.body_y = np.zeros((n, self.max_len), dtype=np.int16)
+        self.head_ptr = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.direction = np.zeros(n, dtype=np.int64)
+        self.food_x = np.zeros(n, dtype=np.int64)
+        self.food_y = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.frame_iteration = np.zeros(n, dtype=np.int64)
+
+        self.reset()
+
+    @property
+    def head_x(self):
+        return self.body_x[self._envs, self.head_ptr].astype(np.int64)
+
+    @property
+    def head_y(self):
+        return self.body_y[self._envs, self.head_ptr].astype(np.int64)
+
+    def reset(self, envs=None):
+        if envs is None:
+            envs = self._envs
+        if len(envs) == 0:
+            return
+
+        self.occupancy[envs] = 0
+        cx, cy = self.cols // 2, self.rows // 2
+        self.head_ptr[envs] = 0
+        self.length[envs] = 3
+        for i in range(3):
+            self.body_x[envs, i] = cx - i
+            self.body_y[envs, i] = cy
+            self.occupancy[envs, cy, cx - i] = 1
+
+        self.direction[envs] = RIGHT
+        self.score[envs] = 0
+        self.frame_iteration[envs] = 0
+        self._place_food(envs)
+
+    def _place_food(self, envs):
+        # pick a uniformly random free cell on every board at once
+        noise = self.rng.random((len(envs), self.rows * self.cols))
+        noise[self.occupancy[envs].reshape(len(envs), -1) > 0] = -1.0
+        cells = noise.argmax(axis=1)
+        self.food_x[envs] = cells % self.cols
+        self.food_y[envs] = cells // self.cols
+
+    def step(self, actions):
+        """
+        Advances every game by one move.
+
+        Args:
+            actions: (n,) move indices or (n, 3) one-hot [straight, right, left].
+
+        Returns:
+            tuple: (states, rewards, dones, scores). scores holds the final
+            score of every game that just ended and the running score of
+            the others.
+        """
+
+        actions = np.asarray(actions)
+        if actions.ndim == 2:
+            actions = actions.argmax(axis=1)
+        self.frame_iteration += 1
+
+        # 1. move: turn and advance the head
+        self.direction = (self.direction + TURN[actions]) % 4
+        hx = self.head_x + DX[self.direction]
+        hy = self.head_y + DY[self.direction]
+
+        self.head_ptr = (self.head_ptr - 1) % self.max_len
+        self.body_x[self._envs, self.head_ptr] = hx
+        self.body_y[self._envs, self.head_ptr] = hy
+        self.length += 1
+
+        # 2. check if game over
+        out = (hx < 0) | (hx >= self.cols) | (hy < 0) | (hy >= self.rows)
+        hit_self = self.occupancy[self._envs, np.clip(hy, 0, self.rows - 1), np.clip(hx, 0, self.cols - 1)] > 0
+        dones = out | hit_self | (self.frame_iteration > 100 * self.length)
+        alive = ~dones
+
+        # 3. place new food or just move
+        eat = alive & (hx == self.food_x) & (hy == self.food_y)
+        self.score += eat
+        rewards = np.where(dones, -10, np.where(eat, 10, 0))
+
+        live = self._envs[alive]
+        self.occupancy[live, hy[alive], hx[alive]] += 1
+
+        moved = self._envs[alive & ~eat]
+        tail = (self.head_ptr[moved] + self.length[moved] - 1) % self.max_len
+        self.occupancy[moved, self.body_y[moved, tail], self.body_x[moved, tail]] -= 1
+        self.length[moved] -= 1
+
+        eaten = self._envs[eat]
+        if len(eaten):
+            self._place_food(eaten)
+
+        # 4. auto-reset finished games
+        scores = self.score.copy()
+        self.reset(self._envs[dones])
+        return self.get_states(), rewards, dones, scores
+
+    def get_states(self):
+        """
+        Returns the (n, 11) state features, in the same order as Agent.get_state.
+        """
+
+        hx, hy = self.head_x, self.head_y
+
+        def danger(direction):
+            px = hx + DX[direction]
+            py = hy + DY[direction]
+            out = (px < 0) | (px >= self.cols) | (py < 0) | (py >= self.rows)
+            occupied = self.occupancy[self._envs, np.clip(py, 0, self.rows - 1), np.clip(px, 0, self.cols - 1)] > 0
+            return out | occupied
+
+        return features.batch_state(self.direction, danger, hx, hy, self.food_x, self.food_y)
@@ -1,7 +1,13 @@
 import pygame
 import turtle
 import time
-import random
+import os
+import sys
+
+# shared game components live in snake-pygame/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snake-pygame'))
+from turtle_board import TurtleBoard
+from turtle_render import CanvasRenderer
 
 # Initialize pygame mixer for audio
 pygame.mixer.init()
@@ -54,6 +60,16 @@ def main_menu():
     wn.onkeypress(start_game, "m")  # Press 'm' to start main play
     wn.onkeypress(quit_game, "q")   # Press 'q' to quit
 
+def place_food():
+
+    """
+    Moves the food to a random free cell that the snake does not cover.
+    """
+
+    pos = board.place_food(avoid=[head.pos()])
+    if pos is not None:
+        food.goto(pos)
+
 def start_snake_game():
 
     """
@@ -62,8 +78,14 @@ def start_snake_game():
     Initializes the snake, food, and game logic.
     """
 
-    global head, food, segments, pen, score, high_score
+    global head, food, segments, pen, score, high_score, renderer, board
     wn.clear()
+
+    # Body segments are drawn on the canvas directly
+    renderer = CanvasRenderer(wn)
+
+    # Segments and food of the 95x53 board the food can spawn on
+    board = TurtleBoard(-47, 47, -26, 26)
     
     # Snake head
     head = turtle.Turtle()
@@ -81,8 +103,9 @@ def start_snake_game():
     food.color("red")
     food.penup()
     food.goto(0,100)
+    board.set_food(food.pos())
 
-    segments = []
+    segments = renderer.body("light green", board)
 
     # Pen
     pen = turtle.Turtle()
@@ -129,15 +152,8 @@ def start_snake_game():
 
         wn.update()
 
-        # Move segments in reverse order
-        for index in range(len(segments)-1, 0, -1):
-            x = segments[index-1].xcor()
-            y = segments[index-1].ycor()
-            segments[index].goto(x, y)
-
-        # Move first segment to head's position
-        if len(segments) > 0:
-            segments[0].goto(head.xcor(), head.ycor())
+        # Move the body one step behind the head
+        segments.follow(head.pos())
 
         # Check for a collision with the border
         if head.xcor()>950 or head.xcor()<-950 or head.ycor()>530 or head.ycor()<-530:
@@ -146,8 +162,6 @@ def start_snake_game():
             time.sleep(1)  # Give time for the sound to play
             head.goto(0,0)
             head.direction = "stop"
-            for segment in segments:
-                segment.goto(1000, 1000)
             segments.clear()
             global score, high_score, delay
             score = 0
@@ -157,13 +171,8 @@ def start_snake_game():
 
         # Check for a collision with the food
         if head.distance(food) < 20:
-            food.goto(random.randint(-950, 950), random.randint(-530, 530))
-            new_segment = turtle.Turtle()
-            new_segment.speed(0)
-            new_segment.shape("square")
-            new_segment.color("light green")
-            new_segment.penup()
-            segments.append(new_segment)
+            place_food()
+            segments.grow()
             delay -= 0.1
             score += 10
             